@@ -7,6 +7,7 @@ import networkx as nx
 import pandas as pd
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
+import heapq
 import json
 
 class CollaborationNode:
@@ -353,13 +354,13 @@ class IntegratedGraph(CollaborationGraph):
     
     def get_top_collaborators(self, n: int = 10) -> List[Dict]:
         """Retorna os top N colaboradores por score de centralidade"""
-        sorted_nodes = sorted(
+        top_nodes = heapq.nlargest(
+            n,
             self.nodes.values(), 
-            key=lambda x: x.metrics["centrality_score"], 
-            reverse=True
+            key=lambda x: x.metrics["centrality_score"]
         )
         
-        return [node.to_dict() for node in sorted_nodes[:n]]
+        return [node.to_dict() for node in top_nodes]
     
     def get_interaction_summary(self) -> Dict:
         """Retorna resumo das interações por tipo"""
@@ -3,19 +3,36 @@ Graph Visualizer
 Módulo para visualização dos grafos de colaboração
 """
 
+import heapq
+import os
+import sys
+import matplotlib
+
+# Execuções em lote (sem display) usam o backend Agg, sem loop de eventos Tk/Qt
+if (os.environ.get('MPLBACKEND') is None and sys.platform.startswith('linux')
+        and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY')):
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 import networkx as nx
 import pandas as pd
 import seaborn as sns
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import numpy as np
 from typing import Dict, List, Tuple
-import os
 from datetime import datetime
 from src.graph_models import CollaborationGraph
 
+# Usa orjson na serialização das figuras do Plotly quando estiver instalado
+try:
+    import orjson
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
 class GraphVisualizer:
     """Classe para visualização dos grafos de colaboração"""
     
@@ -27,6 +44,14 @@ class GraphVisualizer:
         plt.style.use('seaborn-v0_8')
         sns.set_palette("husl")
     
+    def _layout(self, subgraph: nx.Graph, k: float = 1) -> Dict:
+        """
+        Calcula as posições dos nós com spring_layout.
+        
+        A semente fixa mantém o mesmo desenho entre execuções.
+        """
+        return nx.spring_layout(subgraph, k=k, iterations=50, seed=42)
+    
     def plot_graph_basic(self, graph: CollaborationGraph, 
                         figsize: Tuple[int, int] = (12, 8),
                         save: bool = True) -> None:
@@ -35,22 +60,28 @@ class GraphVisualizer:
         fig, ax = plt.subplots(figsize=figsize)
         
         # Filtra nós com mais conexões para melhor visualização
+        # (o layout é sempre calculado sobre o subgrafo, nunca o grafo completo)
         degrees = dict(graph.graph.degree())
-        top_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)[:50]
+        top_nodes = heapq.nlargest(50, degrees.items(), key=lambda x: x[1])
         subgraph = graph.graph.subgraph([node for node, _ in top_nodes])
         
         # Layout do grafo
-        pos = nx.spring_layout(subgraph, k=1, iterations=50)
+        pos = self._layout(subgraph, k=1)
+        
+        # Ordem fixa dos nós, usada em todos os atributos abaixo
+        nodes = list(subgraph.nodes())
+        node_index = {node: i for i, node in enumerate(nodes)}
         
         # Tamanho dos nós baseado no grau
-        node_sizes = [degrees[node] * 20 for node in subgraph.nodes()]
+        node_sizes = np.fromiter((degrees[node] for node in nodes), dtype=np.int32, count=len(nodes)) * 20
         
         # Cor dos nós baseada na centralidade
         centralities = nx.degree_centrality(subgraph)
-        node_colors = [centralities[node] for node in subgraph.nodes()]
+        node_colors = np.fromiter((centralities[node] for node in nodes), dtype=float, count=len(nodes))
         
         # Desenha o grafo
         nx.draw_networkx_nodes(subgraph, pos, 
+                              nodelist=nodes,
                               node_size=node_sizes,
                               node_color=node_colors,
                               cmap=plt.cm.viridis,
@@ -63,7 +94,7 @@ class GraphVisualizer:
         
         # Labels apenas para os top 10 nós
         top_10_nodes = dict(top_nodes[:10])
-        labels = {node: node for node in top_10_nodes.keys() if node in subgraph.nodes()}
+        labels = {node: node for node in top_10_nodes.keys() if node in node_index}
         nx.draw_networkx_labels(subgraph, pos, labels, 
                                font_size=8, font_weight='bold', ax=ax)
         
@@ -77,74 +108,86 @@ class GraphVisualizer:
             print(f"Gráfico salvo: {filepath}")
         
         plt.show()
+        plt.close(fig)
     
     def plot_interactive_graph(self, graph: CollaborationGraph, save: bool = True) -> None:
         """Cria visualização interativa do grafo usando Plotly"""
         
-        # Filtra top 30 nós para performance
+        # Filtra top 30 nós para performance (o layout usa apenas o subgrafo)
         degrees = dict(graph.graph.degree())
-        top_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)[:30]
+        top_nodes = heapq.nlargest(30, degrees.items(), key=lambda x: x[1])
         subgraph = graph.graph.subgraph([node for node, _ in top_nodes])
         
         # Layout do grafo
-        pos = nx.spring_layout(subgraph, k=2, iterations=50)
-        
-        # Prepara dados para Plotly
-        edge_x = []
-        edge_y = []
-        for edge in subgraph.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-        
-        # Trace das arestas
-        edge_trace = go.Scatter(x=edge_x, y=edge_y,
-                               line=dict(width=0.5, color='#888'),
-                               hoverinfo='none',
-                               mode='lines')
+        pos = self._layout(subgraph, k=2)
+        
+        # Prepara dados para Plotly: arestas como pares de índices (formato COO)
+        nodes = list(subgraph.nodes())
+        node_index = {node: i for i, node in enumerate(nodes)}
+        pos_xy = np.array([pos[node] for node in nodes]).reshape(-1, 2)
+        edges = np.fromiter((node_index[node] for edge in subgraph.edges() for node in edge),
+                            dtype=np.int64,
+                            count=2 * subgraph.number_of_edges()).reshape(-1, 2)
+
+        # Cada aresta ocupa três posições: origem, destino e NaN (quebra do segmento)
+        edge_x = np.empty(3 * len(edges))
+        edge_y = np.empty(3 * len(edges))
+        edge_x[0::3] = pos_xy[edges[:, 0], 0]
+        edge_x[1::3] = pos_xy[edges[:, 1], 0]
+        edge_x[2::3] = np.nan
+        edge_y[0::3] = pos_xy[edges[:, 0], 1]
+        edge_y[1::3] = pos_xy[edges[:, 1], 1]
+        edge_y[2::3] = np.nan
+
+        # Trace das arestas (Scattergl renderiza via WebGL, não SVG)
+        edge_trace = go.Scattergl(x=edge_x, y=edge_y,
+                                 line=dict(width=0.5, color='#888'),
+                                 hoverinfo='none',
+                                 mode='lines')
         
         # Prepara dados dos nós
-        node_x = []
-        node_y = []
         node_text = []
         node_size = []
         node_color = []
         
-        for node in subgraph.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            
+        node_x = pos_xy[:, 0]
+        node_y = pos_xy[:, 1]
+        
+        # Referências locais evitam resolver atributos a cada iteração
+        append_text = node_text.append
+        append_size = node_size.append
+        append_color = node_color.append
+        graph_nodes = graph.nodes
+        
+        for node in nodes:
             # Informações do nó
             degree = degrees[node]
-            node_info = graph.nodes.get(node)
+            node_info = graph_nodes.get(node)
+            append_size(max(10, degree * 2))
             if node_info:
-                centrality = node_info.metrics.get('centrality_score', 0)
-                total_interactions = node_info.metrics.get('total_interactions', 0)
+                metrics = node_info.metrics
+                centrality = metrics.get('centrality_score', 0)
+                total_interactions = metrics.get('total_interactions', 0)
                 
-                text = f"{node}<br>Grau: {degree}<br>Centralidade: {centrality:.3f}<br>Interações: {total_interactions}"
-                node_text.append(text)
-                node_size.append(max(10, degree * 2))
-                node_color.append(centrality)
+                append_text(f"{node}<br>Grau: {degree}<br>Centralidade: {centrality:.3f}<br>Interações: {total_interactions}")
+                append_color(centrality)
             else:
-                node_text.append(f"{node}<br>Grau: {degree}")
-                node_size.append(max(10, degree * 2))
-                node_color.append(0)
-        
-        # Trace dos nós
-        node_trace = go.Scatter(x=node_x, y=node_y,
-                               mode='markers+text',
-                               hoverinfo='text',
-                               text=[node for node in subgraph.nodes()],
-                               textposition="middle center",
-                               hovertext=node_text,
-                               marker=dict(size=node_size,
-                                          color=node_color,
-                                          colorscale='Viridis',
-                                          showscale=True,
-                                          colorbar=dict(title="Centralidade"),
-                                          line=dict(width=1, color='#000')))
+                append_text(f"{node}<br>Grau: {degree}")
+                append_color(0)
+        
+        # Trace dos nós (para subgrafos grandes, mode='markers' dispensa os rótulos)
+        node_trace = go.Scattergl(x=node_x, y=node_y,
+                                 mode='markers+text',
+                                 hoverinfo='text',
+                                 text=nodes,
+                                 textposition="middle center",
+                                 hovertext=node_text,
+                                 marker=dict(size=node_size,
+                                            color=node_color,
+                                            colorscale='Viridis',
+                                            showscale=True,
+                                            colorbar=dict(title="Centralidade"),
+                                            line=dict(width=1, color='#000')))
         
         # Cria figura
         fig = go.Figure(data=[edge_trace, node_trace],
@@ -177,47 +220,87 @@ class GraphVisualizer:
                                   save: bool = True) -> None:
         """Compara métricas de centralidade entre diferentes grafos"""
         
-        # Coleta dados de centralidade
-        data = []
+        # Métricas preenchidas por calculate_centrality_metrics
+        centrality_keys = ('in_degree_centrality', 'out_degree_centrality',
+                           'closeness_centrality', 'betweenness_centrality', 'pagerank')
+        in_key, out_key, closeness_key, betweenness_key, pagerank_key = centrality_keys
+
+        # Seleciona os grafos com centralidades calculadas
+        selected = []
         for graph_name, graph in graphs.items():
-            for username, node in graph.nodes.items():
-                metrics = node.metrics
-                data.append({
-                    'graph': graph_name,
-                    'username': username,
-                    'degree_centrality': metrics.get('in_degree_centrality', 0) + 
-                                       metrics.get('out_degree_centrality', 0),
-                    'closeness_centrality': metrics.get('closeness_centrality', 0),
-                    'betweenness_centrality': metrics.get('betweenness_centrality', 0),
-                    'pagerank': metrics.get('pagerank', 0),
-                    'total_interactions': metrics.get('total_interactions', 0)
-                })
-        
-        df = pd.DataFrame(data)
-        
-        # Cria subplots
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+            if not graph.nodes:
+                continue
+
+            # Ignora grafos cujas centralidades ainda não foram calculadas
+            sample_metrics = next(iter(graph.nodes.values())).metrics
+            if not all(key in sample_metrics for key in centrality_keys):
+                print(f"Centralidades não calculadas para o grafo '{graph_name}', ignorando")
+                continue
+
+            selected.append((graph_name, graph))
+
+        if not selected:
+            print("Nenhum grafo com centralidades calculadas para comparar")
+            return
+
+        # Pré-aloca uma coluna por métrica e preenche cada grafo em sua faixa
+        total = sum(len(graph.nodes) for _, graph in selected)
+        graph_col = np.empty(total, dtype=object)
+        user_col = np.empty(total, dtype=object)
+        deg = np.empty(total)
+        clo = np.empty(total)
+        bet = np.empty(total)
+        pr = np.empty(total)
+        tot = np.empty(total, dtype=np.int64)
+
+        start = 0
+        for graph_name, graph in selected:
+            n = len(graph.nodes)
+            end = start + n
+            metrics_list = [node.metrics for node in graph.nodes.values()]
+
+            graph_col[start:end] = graph_name
+            user_col[start:end] = list(graph.nodes.keys())
+            deg[start:end] = np.fromiter((m.get(in_key, 0) + m.get(out_key, 0) for m in metrics_list),
+                                         dtype=float, count=n)
+            clo[start:end] = np.fromiter((m.get(closeness_key, 0) for m in metrics_list),
+                                         dtype=float, count=n)
+            bet[start:end] = np.fromiter((m.get(betweenness_key, 0) for m in metrics_list),
+                                         dtype=float, count=n)
+            pr[start:end] = np.fromiter((m.get(pagerank_key, 0) for m in metrics_list),
+                                        dtype=float, count=n)
+            tot[start:end] = np.fromiter((m.get('total_interactions', 0) for m in metrics_list),
+                                         dtype=np.int64, count=n)
+            start = end
+
+        df = pd.DataFrame({
+            'graph': graph_col,
+            'username': user_col,
+            'degree_centrality': deg,
+            'closeness_centrality': clo,
+            'betweenness_centrality': bet,
+            'pagerank': pr,
+            'total_interactions': tot
+        })
+        
+        # Formato longo: uma linha por (nó, métrica), plotado em uma única grade 2x2
+        metric_titles = {
+            'degree_centrality': 'Centralidade de Grau',
+            'closeness_centrality': 'Centralidade de Proximidade',
+            'betweenness_centrality': 'Centralidade de Intermediação',
+            'pagerank': 'PageRank'
+        }
+        long_df = df.melt(id_vars=['graph'], value_vars=list(metric_titles),
+                          var_name='metric', value_name='value')
+        
+        grid = sns.catplot(data=long_df, x='graph', y='value', col='metric', col_wrap=2,
+                           kind='box', sharey=False, height=6, aspect=1.25)
+        fig = grid.figure
         fig.suptitle('Comparação de Métricas de Centralidade', fontsize=16, fontweight='bold')
         
-        # Plot 1: Degree Centrality
-        sns.boxplot(data=df, x='graph', y='degree_centrality', ax=axes[0,0])
-        axes[0,0].set_title('Centralidade de Grau')
-        axes[0,0].tick_params(axis='x', rotation=45)
-        
-        # Plot 2: Closeness Centrality
-        sns.boxplot(data=df, x='graph', y='closeness_centrality', ax=axes[0,1])
-        axes[0,1].set_title('Centralidade de Proximidade')
-        axes[0,1].tick_params(axis='x', rotation=45)
-        
-        # Plot 3: Betweenness Centrality
-        sns.boxplot(data=df, x='graph', y='betweenness_centrality', ax=axes[1,0])
-        axes[1,0].set_title('Centralidade de Intermediação')
-        axes[1,0].tick_params(axis='x', rotation=45)
-        
-        # Plot 4: PageRank
-        sns.boxplot(data=df, x='graph', y='pagerank', ax=axes[1,1])
-        axes[1,1].set_title('PageRank')
-        axes[1,1].tick_params(axis='x', rotation=45)
+        for metric, ax in grid.axes_dict.items():
+            ax.set_title(metric_titles[metric])
+            ax.tick_params(axis='x', rotation=45)
         
         plt.tight_layout()
         
@@ -227,24 +310,21 @@ class GraphVisualizer:
             print(f"Comparação de centralidade salva: {filepath}")
         
         plt.show()
+        plt.close(fig)
     
     def plot_graph_metrics(self, graphs: Dict[str, CollaborationGraph], 
                           save: bool = True) -> None:
         """Plota métricas básicas dos grafos"""
         
-        # Coleta estatísticas
+        # Coleta estatísticas (uma tupla por grafo, na ordem das colunas)
         stats_data = []
         for name, graph in graphs.items():
             stats = graph.get_stats()
-            stats_data.append({
-                'Grafo': name,
-                'Nós': stats['nodes'],
-                'Arestas': stats['edges'],
-                'Peso Total': stats['total_weight'],
-                'Densidade': stats['density']
-            })
+            stats_data.append((name, stats['nodes'], stats['edges'],
+                               stats['total_weight'], stats['density']))
         
-        df_stats = pd.DataFrame(stats_data)
+        df_stats = pd.DataFrame.from_records(
+            stats_data, columns=['Grafo', 'Nós', 'Arestas', 'Peso Total', 'Densidade'])
         
         # Cria subplots
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
@@ -278,6 +358,7 @@ class GraphVisualizer:
             print(f"Métricas dos grafos salvas: {filepath}")
         
         plt.show()
+        plt.close(fig)
     
     def plot_top_collaborators(self, integrated_graph: CollaborationGraph, 
                               n: int = 15, save: bool = True) -> None:
@@ -306,8 +387,7 @@ class GraphVisualizer:
         ax1.invert_yaxis()
         
         # Adiciona valores nas barras
-        for i, v in enumerate(centrality_scores):
-            ax1.text(v + 0.001, i, f'{v:.3f}', va='center', fontsize=9)
+        ax1.bar_label(bars1, fmt='%.3f', padding=2, fontsize=9)
         
         # Plot 2: Total de interações
         bars2 = ax2.barh(range(len(usernames)), total_interactions, color='lightcoral')
@@ -318,8 +398,7 @@ class GraphVisualizer:
         ax2.invert_yaxis()
         
         # Adiciona valores nas barras
-        for i, v in enumerate(total_interactions):
-            ax2.text(v + max(total_interactions)*0.01, i, str(v), va='center', fontsize=9)
+        ax2.bar_label(bars2, labels=[str(v) for v in total_interactions], padding=2, fontsize=9)
         
         plt.tight_layout()
         
@@ -329,6 +408,7 @@ class GraphVisualizer:
             print(f"Top colaboradores salvos: {filepath}")
         
         plt.show()
+        plt.close(fig)
     
     def create_complete_html_report(self, graphs: Dict[str, CollaborationGraph], save: bool = True):
         """Cria um relatório HTML completo com todos os grafos e interpretações"""
@@ -7,7 +7,7 @@ e métodos auxiliares para implementações de grafos.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 class AbstractGraph(ABC):
     """
@@ -19,6 +19,9 @@ class AbstractGraph(ABC):
     - edge_weights: pesos das arestas
     """
     
+    # Atributos fixos: sem __dict__ por instância
+    __slots__ = ('_num_vertices', '_vertex_labels', '_vertex_weights', '_cache')
+    
     def __init__(self, num_vertices: int):
         """
         Inicializa o grafo com número especificado de vértices.
@@ -35,7 +38,9 @@ class AbstractGraph(ABC):
         self._num_vertices = num_vertices
         self._vertex_labels: Dict[int, str] = {}
         self._vertex_weights: Dict[int, float] = {}
-        self._edge_weights: Dict[tuple, float] = {}
+        
+        # Propriedades derivadas em cache (limpo a cada alteração nas arestas)
+        self._cache: Dict[str, bool] = {}
         
     def _validate_vertex(self, vertex: int) -> None:
         """
@@ -61,6 +66,10 @@ class AbstractGraph(ABC):
         Raises:
             IndexError: Se algum índice for inválido
         """
+        # Caminho rápido: uma única comparação encadeada no caso comum
+        n = self._num_vertices
+        if 0 <= u < n and 0 <= v < n:
+            return
         self._validate_vertex(u)
         self._validate_vertex(v)
         
@@ -78,6 +87,22 @@ class AbstractGraph(ABC):
         if u == v:
             raise ValueError("Grafos simples não permitem laços (self-loops)")
 
+    def _cached(self, key: str, compute: Callable[[], bool]) -> bool:
+        """
+        Retorna a propriedade em cache ou a calcula e armazena.
+        
+        Args:
+            key: Nome da propriedade
+            compute: Função que calcula o valor
+            
+        Returns:
+            Valor da propriedade
+        """
+        cache = self._cache
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+
     # =================================================================
     # API OBRIGATÓRIA - MÉTODOS ABSTRATOS
     # =================================================================
@@ -136,6 +161,43 @@ class AbstractGraph(ABC):
     # API OBRIGATÓRIA - MÉTODOS CONCRETOS
     # =================================================================
     
+    def addEdgesFrom(self, edges: Iterable[Tuple[int, int]]) -> None:
+        """
+        Adiciona várias arestas de uma vez (operação idempotente).
+        
+        Todas as arestas são validadas antes de qualquer inserção, de modo
+        que uma aresta inválida não deixa o grafo parcialmente alterado.
+        
+        Args:
+            edges: Pares (origem, destino)
+            
+        Raises:
+            IndexError: Se algum índice for inválido
+            ValueError: Se alguma aresta for um laço (u == v)
+        """
+        edges = list(edges)
+        for u, v in edges:
+            self._validate_vertices(u, v)
+            self._validate_no_self_loop(u, v)
+        for u, v in edges:
+            self.addEdge(u, v)
+    
+    @classmethod
+    def fromEdges(cls, num_vertices: int, edges: Iterable[Tuple[int, int]]) -> 'AbstractGraph':
+        """
+        Cria um grafo já com as arestas informadas.
+        
+        Args:
+            num_vertices: Número de vértices do grafo
+            edges: Pares (origem, destino)
+            
+        Returns:
+            Novo grafo da classe chamada
+        """
+        graph = cls(num_vertices)
+        graph.addEdgesFrom(edges)
+        return graph
+    
     def isDivergent(self, u1: int, v1: int, u2: int, v2: int) -> bool:
         """
         Verifica se duas arestas são divergentes (mesmo vértice de origem).
@@ -218,6 +280,7 @@ class AbstractGraph(ABC):
         self._validate_vertex(v)
         return self._vertex_weights.get(v, 0.0)
     
+    @abstractmethod
     def setEdgeWeight(self, u: int, v: int, w: float) -> None:
         """
         Define o peso da aresta (u,v).
@@ -231,11 +294,9 @@ class AbstractGraph(ABC):
             IndexError: Se algum índice for inválido
             ValueError: Se a aresta não existir
         """
-        self._validate_vertices(u, v)
-        if not self.hasEdge(u, v):
-            raise ValueError(f"Aresta ({u},{v}) não existe")
-        self._edge_weights[(u, v)] = w
+        pass
     
+    @abstractmethod
     def getEdgeWeight(self, u: int, v: int) -> float:
         """
         Retorna o peso da aresta (u,v).
@@ -251,10 +312,7 @@ class AbstractGraph(ABC):
             IndexError: Se algum índice for inválido
             ValueError: Se a aresta não existir
         """
-        self._validate_vertices(u, v)
-        if not self.hasEdge(u, v):
-            raise ValueError(f"Aresta ({u},{v}) não existe")
-        return self._edge_weights.get((u, v), 1.0)
+        pass
     
     def isEmptyGraph(self) -> bool:
         """
@@ -269,13 +327,34 @@ class AbstractGraph(ABC):
         """
         Verifica se o grafo é completo.
         
+        Como o grafo é simples (sem laços nem arestas múltiplas), ele é
+        completo exatamente quando tem n(n-1) arestas; com o contador de
+        arestas das implementações, a verificação é O(1), sem consultar
+        hasEdge para cada par.
+        
         Returns:
             True se existe aresta entre todos os pares de vértices
         """
-        n = self.getVertexCount()
+        n = self._num_vertices
         max_edges = n * (n - 1)  # Grafo direcionado sem laços
         return self.getEdgeCount() == max_edges
     
+    def _iter_edges(self) -> Iterator[Tuple[int, int, float]]:
+        """
+        Percorre todas as arestas (u, v) do grafo junto com seus pesos.
+        
+        Implementação genérica testando cada par com hasEdge (O(V²));
+        as subclasses sobrescrevem percorrendo sua própria estrutura.
+        
+        Yields:
+            Triplas (origem, destino, peso)
+        """
+        n = self.getVertexCount()
+        for u in range(n):
+            for v in range(n):
+                if self.hasEdge(u, v):
+                    yield u, v, self.getEdgeWeight(u, v)
+    
     # =================================================================
     # EXPORTAÇÃO PARA GEPHI
     # =================================================================
@@ -292,43 +371,41 @@ class AbstractGraph(ABC):
             IOError: Se não conseguir escrever o arquivo
         """
         try:
-            # Constrói o XML manualmente como string
-            xml_content = []
-            xml_content.append('<?xml version="1.0" encoding="UTF-8"?>')
-            xml_content.append('<gexf xmlns="http://www.gexf.net/1.2draft" version="1.2">')
-            xml_content.append('  <graph mode="static" defaultedgetype="directed">')
-            
-            # Adiciona nós
-            xml_content.append('    <nodes>')
-            for i in range(self.getVertexCount()):
-                weight = self.getVertexWeight(i)
-                if weight != 0.0:
-                    xml_content.append(f'      <node id="{i}" label="{i}" weight="{weight}"/>')
-                else:
-                    xml_content.append(f'      <node id="{i}" label="{i}"/>')
-            xml_content.append('    </nodes>')
-            
-            # Adiciona arestas
-            xml_content.append('    <edges>')
-            edge_id = 0
-            
-            for u in range(self.getVertexCount()):
-                for v in range(self.getVertexCount()):
-                    if self.hasEdge(u, v):
-                        weight = self.getEdgeWeight(u, v)
-                        if weight != 1.0:
-                            xml_content.append(f'      <edge id="{edge_id}" source="{u}" target="{v}" weight="{weight}"/>')
-                        else:
-                            xml_content.append(f'      <edge id="{edge_id}" source="{u}" target="{v}"/>')
-                        edge_id += 1
-            
-            xml_content.append('    </edges>')
-            xml_content.append('  </graph>')
-            xml_content.append('</gexf>')
-            
-            # Salva arquivo
+            # Grava o XML linha a linha, sem montar o documento inteiro em memória
             with open(path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(xml_content))
+                write = f.write
+                write('<?xml version="1.0" encoding="UTF-8"?>')
+                write('\n<gexf xmlns="http://www.gexf.net/1.2draft" version="1.2">')
+                write('\n  <graph mode="static" defaultedgetype="directed">')
+                
+                # Identificadores convertidos para texto uma única vez
+                vertex_ids = [str(i) for i in range(self.getVertexCount())]
+                vertex_weights = self._vertex_weights
+                
+                # Adiciona nós
+                write('\n    <nodes>')
+                for i, vid in enumerate(vertex_ids):
+                    weight = vertex_weights.get(i, 0.0)
+                    if weight != 0.0:
+                        write(f'\n      <node id="{vid}" label="{vid}" weight="{weight}"/>')
+                    else:
+                        write(f'\n      <node id="{vid}" label="{vid}"/>')
+                write('\n    </nodes>')
+                
+                # Adiciona arestas
+                write('\n    <edges>')
+                edge_id = 0
+                
+                for u, v, weight in self._iter_edges():
+                    if weight != 1.0:
+                        write(f'\n      <edge id="{edge_id}" source="{vertex_ids[u]}" target="{vertex_ids[v]}" weight="{weight}"/>')
+                    else:
+                        write(f'\n      <edge id="{edge_id}" source="{vertex_ids[u]}" target="{vertex_ids[v]}"/>')
+                    edge_id += 1
+                
+                write('\n    </edges>')
+                write('\n  </graph>')
+                write('\n</gexf>')
                 
         except Exception as e:
             raise IOError(f"Erro ao exportar para GEPHI: {e}")
\ No newline at end of file
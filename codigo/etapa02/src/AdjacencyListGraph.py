@@ -5,16 +5,28 @@ Trabalho de Teoria dos Grafos - Etapa 2
 Implementação da API utilizando listas de adjacência.
 """
 
-from typing import Dict, List, Set
+from array import array
+from types import MappingProxyType
+from typing import (AbstractSet, Collection, Dict, Iterable, Iterator, List, Mapping,
+                    Optional, Set, Tuple, Union)
 from .AbstractGraph import AbstractGraph
+from ._kernels import weak_connected_union_find
 
 class AdjacencyListGraph(AbstractGraph):
     """
     Implementação de grafo usando listas de adjacência.
     
-    Cada vértice mantém um conjunto (set) de seus sucessores.
+    Cada vértice mantém um dicionário sucessor -> peso da aresta e a
+    coleção de seus predecessores (lista de adjacência reversa): um
+    array('i') compacto enquanto pequena, promovida a set ao crescer.
     """
     
+    # Atributos fixos: sem __dict__ por instância
+    __slots__ = ('_adj_list', '_rev_adj_list', '_edge_count', '_csr')
+    
+    # Grau de entrada a partir do qual os predecessores passam de array para set
+    _PROMOTE_THRESHOLD = 32
+    
     def __init__(self, num_vertices: int):
         """
         Inicializa grafo com listas de adjacência.
@@ -27,10 +39,19 @@ class AdjacencyListGraph(AbstractGraph):
         """
         super().__init__(num_vertices)
         
-        # Inicializa listas de adjacência
-        self._adj_list: Dict[int, Set[int]] = {
-            i: set() for i in range(num_vertices)
-        }
+        # Listas de adjacência indexadas pelo vértice (sucessor -> peso da aresta)
+        self._adj_list: List[Dict[int, float]] = [{} for _ in range(num_vertices)]
+        
+        # Listas de adjacência reversas (predecessores de cada vértice)
+        self._rev_adj_list: List[Union[array, Set[int]]] = [
+            array('i') for _ in range(num_vertices)
+        ]
+        
+        # Contador de arestas mantido por addEdge/removeEdge
+        self._edge_count = 0
+        
+        # Vetores CSR em cache (invalidados quando as arestas mudam)
+        self._csr: Optional[Tuple[array, array]] = None
     
     # =================================================================
     # IMPLEMENTAÇÃO DA API OBRIGATÓRIA
@@ -52,10 +73,7 @@ class AdjacencyListGraph(AbstractGraph):
         Returns:
             Número de arestas
         """
-        edge_count = 0
-        for vertex in self._adj_list:
-            edge_count += len(self._adj_list[vertex])
-        return edge_count
+        return self._edge_count
     
     def hasEdge(self, u: int, v: int) -> bool:
         """
@@ -89,8 +107,51 @@ class AdjacencyListGraph(AbstractGraph):
         self._validate_vertices(u, v)
         self._validate_no_self_loop(u, v)
         
-        # Operação idempotente - set não duplica elementos
-        self._adj_list[u].add(v)
+        # Operação idempotente - só conta a aresta se ela ainda não existir
+        successors = self._adj_list[u]
+        if v not in successors:
+            successors[v] = 1.0
+            self._add_predecessor(v, u)
+            self._edge_count += 1
+            self._csr = None
+            self._cache.clear()
+    
+    def addEdgesFrom(self, edges: Iterable[Tuple[int, int]]) -> None:
+        """
+        Adiciona várias arestas de uma vez (operação idempotente).
+        
+        Valida tudo antes de inserir e depois preenche as listas direto,
+        invalidando os caches uma única vez ao final.
+        
+        Args:
+            edges: Pares (origem, destino)
+            
+        Raises:
+            IndexError: Se algum índice for inválido
+            ValueError: Se alguma aresta for um laço (u == v)
+        """
+        edges = list(edges)
+        n = self._num_vertices
+        for u, v in edges:
+            if not (0 <= u < n and 0 <= v < n):
+                self._validate_vertices(u, v)
+            if u == v:
+                self._validate_no_self_loop(u, v)
+        
+        adj_list = self._adj_list
+        add_predecessor = self._add_predecessor
+        added = 0
+        for u, v in edges:
+            successors = adj_list[u]
+            if v not in successors:
+                successors[v] = 1.0
+                add_predecessor(v, u)
+                added += 1
+        
+        if added:
+            self._edge_count += added
+            self._csr = None
+            self._cache.clear()
     
     def removeEdge(self, u: int, v: int) -> None:
         """
@@ -104,11 +165,13 @@ class AdjacencyListGraph(AbstractGraph):
             IndexError: Se algum índice for inválido
         """
         self._validate_vertices(u, v)
-        self._adj_list[u].discard(v)  # discard não gera erro se elemento não existir
-        
-        # Remove peso da aresta se existir
-        if (u, v) in self._edge_weights:
-            del self._edge_weights[(u, v)]
+        successors = self._adj_list[u]
+        if v in successors:  # remover aresta inexistente não gera erro
+            del successors[v]  # o peso é removido junto com a aresta
+            self._rev_adj_list[v].remove(u)
+            self._edge_count -= 1
+            self._csr = None
+            self._cache.clear()
     
     def isSucessor(self, u: int, v: int) -> bool:
         """
@@ -140,7 +203,8 @@ class AdjacencyListGraph(AbstractGraph):
         Raises:
             IndexError: Se algum índice for inválido
         """
-        return self.hasEdge(u, v)
+        self._validate_vertices(u, v)
+        return u in self._rev_adj_list[v]
     
     def getVertexInDegree(self, u: int) -> int:
         """
@@ -156,12 +220,7 @@ class AdjacencyListGraph(AbstractGraph):
             IndexError: Se o índice for inválido
         """
         self._validate_vertex(u)
-        
-        in_degree = 0
-        for vertex in self._adj_list:
-            if u in self._adj_list[vertex]:
-                in_degree += 1
-        return in_degree
+        return len(self._rev_adj_list[u])
     
     def getVertexOutDegree(self, u: int) -> int:
         """
@@ -179,45 +238,77 @@ class AdjacencyListGraph(AbstractGraph):
         self._validate_vertex(u)
         return len(self._adj_list[u])
     
-    def isConnected(self) -> bool:
+    def setEdgeWeight(self, u: int, v: int, w: float) -> None:
         """
-        Verifica se o grafo é conectado usando DFS.
+        Define o peso da aresta (u,v), armazenado na própria lista de adjacência.
         
-        Para grafo direcionado, verifica se é fracamente conectado
-        (conectado quando considerado como não-direcionado).
+        Args:
+            u: Vértice origem
+            v: Vértice destino
+            w: Peso da aresta
+            
+        Raises:
+            IndexError: Se algum índice for inválido
+            ValueError: Se a aresta não existir
+        """
+        self._validate_vertices(u, v)
+        successors = self._adj_list[u]
+        if v not in successors:
+            raise ValueError(f"Aresta ({u},{v}) não existe")
+        successors[v] = w
+    
+    def getEdgeWeight(self, u: int, v: int) -> float:
+        """
+        Retorna o peso da aresta (u,v).
         
+        Args:
+            u: Vértice origem
+            v: Vértice destino
+            
         Returns:
-            True se o grafo é conectado
-        """
-        if self._num_vertices <= 1:
-            return True
+            Peso da aresta (1.0 se não definido)
             
-        # DFS a partir do vértice 0
-        visited = [False] * self._num_vertices
-        self._dfs_connected(0, visited)
-        
-        # Verifica se todos os vértices foram visitados
-        return all(visited)
+        Raises:
+            IndexError: Se algum índice for inválido
+            ValueError: Se a aresta não existir
+        """
+        self._validate_vertices(u, v)
+        successors = self._adj_list[u]
+        if v not in successors:
+            raise ValueError(f"Aresta ({u},{v}) não existe")
+        return successors[v]
     
-    def _dfs_connected(self, vertex: int, visited: List[bool]) -> None:
+    def _add_predecessor(self, v: int, u: int) -> None:
         """
-        DFS auxiliar para verificação de conectividade.
+        Registra u como predecessor de v, promovendo o array a set quando
+        o grau de entrada passa de _PROMOTE_THRESHOLD.
         
         Args:
-            vertex: Vértice atual
-            visited: Lista de vértices visitados
+            v: Vértice destino
+            u: Novo predecessor
+        """
+        predecessors = self._rev_adj_list[v]
+        if type(predecessors) is array:
+            predecessors.append(u)
+            if len(predecessors) > self._PROMOTE_THRESHOLD:
+                self._rev_adj_list[v] = set(predecessors)
+        else:
+            predecessors.add(u)
+    
+    def isConnected(self) -> bool:
         """
-        visited[vertex] = True
+        Verifica se o grafo é conectado usando Union-Find.
         
-        # Visita sucessores
-        for successor in self._adj_list[vertex]:
-            if not visited[successor]:
-                self._dfs_connected(successor, visited)
+        Para grafo direcionado, verifica se é fracamente conectado
+        (conectado quando considerado como não-direcionado).
         
-        # Visita predecessores (para conectividade fraca)
-        for v in range(self._num_vertices):
-            if not visited[v] and vertex in self._adj_list[v]:
-                self._dfs_connected(v, visited)
+        Returns:
+            True se o grafo é conectado
+        """
+        # Union-Find em uma passada pelas arestas; a direção é ignorada
+        # (conectividade fraca). O resultado fica em cache até a próxima alteração.
+        return self._cached('connected', lambda: weak_connected_union_find(
+            self._adj_list, self._num_vertices))
     
     # =================================================================
     # MÉTODOS AUXILIARES
@@ -230,21 +321,34 @@ class AdjacencyListGraph(AbstractGraph):
         Returns:
             String representando as listas
         """
-        result = "AdjacencyListGraph:\n"
-        for vertex in range(self._num_vertices):
-            successors = sorted(list(self._adj_list[vertex]))
-            result += f"  {vertex}: {successors}\n"
-        return result
+        parts = ["AdjacencyListGraph:\n"]
+        for vertex, successors in enumerate(self._adj_list):
+            parts.append(f"  {vertex}: {sorted(successors)}\n")
+        return "".join(parts)
+    
+    def _iter_edges(self) -> Iterator[Tuple[int, int, float]]:
+        """
+        Percorre as arestas direto das listas de adjacência, em O(V + E).
+        
+        Os sucessores saem na ordem de inserção, sem ordenação, com o peso
+        lido do próprio dicionário de adjacência.
+        
+        Yields:
+            Triplas (origem, destino, peso)
+        """
+        for u, successors in enumerate(self._adj_list):
+            for v, weight in successors.items():
+                yield u, v, weight
     
-    def getAdjacencyList(self) -> Dict[int, Set[int]]:
+    def getAdjacencyList(self) -> Mapping[int, AbstractSet[int]]:
         """
-        Retorna cópia das listas de adjacência.
+        Retorna cópia somente leitura das listas de adjacência.
         
         Returns:
-            Dicionário com as listas de adjacência
+            Mapeamento imutável vértice -> frozenset de sucessores
         """
-        return {vertex: self._adj_list[vertex].copy() 
-                for vertex in self._adj_list}
+        return MappingProxyType({vertex: frozenset(successors)
+                                 for vertex, successors in enumerate(self._adj_list)})
     
     def getSuccessors(self, u: int) -> Set[int]:
         """
@@ -260,7 +364,7 @@ class AdjacencyListGraph(AbstractGraph):
             IndexError: Se o índice for inválido
         """
         self._validate_vertex(u)
-        return self._adj_list[u].copy()
+        return set(self._adj_list[u])
     
     def getPredecessors(self, u: int) -> Set[int]:
         """
@@ -276,9 +380,83 @@ class AdjacencyListGraph(AbstractGraph):
             IndexError: Se o índice for inválido
         """
         self._validate_vertex(u)
+        return set(self._rev_adj_list[u])
+    
+    def getSuccessorsView(self, u: int) -> AbstractSet[int]:
+        """
+        Retorna os sucessores do vértice u sem copiar o conjunto.
+        
+        O conjunto retornado é o interno do grafo: deve ser tratado como
+        somente leitura e reflete alterações posteriores nas arestas.
+        
+        Args:
+            u: Índice do vértice
+            
+        Returns:
+            Conjunto (somente leitura) dos sucessores de u
+            
+        Raises:
+            IndexError: Se o índice for inválido
+        """
+        self._validate_vertex(u)
+        return self._adj_list[u].keys()
+    
+    def getPredecessorsView(self, u: int) -> Collection[int]:
+        """
+        Retorna os predecessores do vértice u sem copiá-los.
+        
+        A coleção retornada é a interna do grafo (array ou set, conforme o
+        grau): deve ser tratada como somente leitura e reflete alterações
+        posteriores nas arestas.
+        
+        Args:
+            u: Índice do vértice
+            
+        Returns:
+            Coleção (somente leitura) dos predecessores de u
+            
+        Raises:
+            IndexError: Se o índice for inválido
+        """
+        self._validate_vertex(u)
+        return self._rev_adj_list[u]
+    
+    # =================================================================
+    # REPRESENTAÇÃO CSR (SOMENTE LEITURA)
+    # =================================================================
+    
+    @staticmethod
+    def _build_csr(neighbor_lists: Iterable[Iterable[int]],
+                   num_vertices: int) -> Tuple[array, array]:
+        """
+        Monta os vetores CSR a partir das vizinhanças de cada vértice.
+        
+        Args:
+            neighbor_lists: Vizinhos de cada vértice, na ordem 0..n-1
+            num_vertices: Número de vértices
+            
+        Returns:
+            Tupla (indptr, indices)
+        """
+        indptr = array('q', bytes(8 * (num_vertices + 1)))
+        indices = array('i')
+        for vertex, neighbors in enumerate(neighbor_lists):
+            indices.extend(neighbors)
+            indptr[vertex + 1] = len(indices)
+        return indptr, indices
+    
+    def freeze(self) -> Tuple[array, array]:
+        """
+        Converte as listas de adjacência para o formato CSR.
         
-        predecessors = set()
-        for vertex in self._adj_list:
-            if u in self._adj_list[vertex]:
-                predecessors.add(vertex)
-        return predecessors
\ No newline at end of file
+        Os sucessores de u ficam em indices[indptr[u]:indptr[u+1]], em dois
+        vetores contíguos (array.array), sem um objeto set por vértice.
+        Os vetores ficam em cache até a próxima alteração nas arestas e
+        devem ser tratados como somente leitura.
+        
+        Returns:
+            Tupla (indptr, indices) com indptr de tamanho n+1
+        """
+        if self._csr is None:
+            self._csr = self._build_csr(self._adj_list, self._num_vertices)
+        return self._csr
@@ -5,17 +5,21 @@ Trabalho de Teoria dos Grafos - Etapa 2
 Implementação da API utilizando matriz de adjacência.
 """
 
-from typing import List
+from typing import Dict, Iterator, List, Tuple
 from .AbstractGraph import AbstractGraph
 
 class AdjacencyMatrixGraph(AbstractGraph):
     """
     Implementação de grafo usando matriz de adjacência.
     
-    A matriz é uma lista de listas onde matrix[u][v] = True
-    indica que existe aresta do vértice u para o vértice v.
+    A matriz é uma lista de linhas (bytearray, 1 byte por célula) onde
+    matrix[u][v] = 1 indica que existe aresta do vértice u para o vértice v.
+    A transposta é mantida junto para consultar predecessores por linha.
     """
     
+    # Atributos fixos: sem __dict__ por instância
+    __slots__ = ('_matrix', '_matrix_t', '_weight_rows', '_edge_count')
+    
     def __init__(self, num_vertices: int):
         """
         Inicializa grafo com matriz de adjacência.
@@ -28,11 +32,21 @@ class AdjacencyMatrixGraph(AbstractGraph):
         """
         super().__init__(num_vertices)
         
-        # Inicializa matriz de adjacência (False = sem aresta)
-        self._matrix: List[List[bool]] = [
-            [False for _ in range(num_vertices)] 
-            for _ in range(num_vertices)
+        # Inicializa matriz de adjacência (0 = sem aresta)
+        self._matrix: List[bytearray] = [
+            bytearray(num_vertices) for _ in range(num_vertices)
+        ]
+        
+        # Matriz transposta: linha v marca os predecessores de v
+        self._matrix_t: List[bytearray] = [
+            bytearray(num_vertices) for _ in range(num_vertices)
         ]
+        
+        # Pesos das arestas por linha (só os diferentes do padrão 1.0)
+        self._weight_rows: List[Dict[int, float]] = [{} for _ in range(num_vertices)]
+        
+        # Contador de arestas mantido por addEdge/removeEdge
+        self._edge_count = 0
     
     # =================================================================
     # IMPLEMENTAÇÃO DA API OBRIGATÓRIA
@@ -54,12 +68,7 @@ class AdjacencyMatrixGraph(AbstractGraph):
         Returns:
             Número de arestas
         """
-        edge_count = 0
-        for i in range(self._num_vertices):
-            for j in range(self._num_vertices):
-                if self._matrix[i][j]:
-                    edge_count += 1
-        return edge_count
+        return self._edge_count
     
     def hasEdge(self, u: int, v: int) -> bool:
         """
@@ -76,7 +85,7 @@ class AdjacencyMatrixGraph(AbstractGraph):
             IndexError: Se algum índice for inválido
         """
         self._validate_vertices(u, v)
-        return self._matrix[u][v]
+        return self._matrix[u][v] == 1
     
     def addEdge(self, u: int, v: int) -> None:
         """
@@ -93,8 +102,13 @@ class AdjacencyMatrixGraph(AbstractGraph):
         self._validate_vertices(u, v)
         self._validate_no_self_loop(u, v)
         
-        # Operação idempotente - não duplica aresta
-        self._matrix[u][v] = True
+        # Operação idempotente - só conta a aresta se ela ainda não existir
+        row = self._matrix[u]
+        if not row[v]:
+            row[v] = 1
+            self._matrix_t[v][u] = 1
+            self._edge_count += 1
+            self._cache.clear()
     
     def removeEdge(self, u: int, v: int) -> None:
         """
@@ -108,11 +122,13 @@ class AdjacencyMatrixGraph(AbstractGraph):
             IndexError: Se algum índice for inválido
         """
         self._validate_vertices(u, v)
-        self._matrix[u][v] = False
-        
-        # Remove peso da aresta se existir
-        if (u, v) in self._edge_weights:
-            del self._edge_weights[(u, v)]
+        row = self._matrix[u]
+        if row[v]:  # remover aresta inexistente não gera erro
+            row[v] = 0
+            self._matrix_t[v][u] = 0
+            self._edge_count -= 1
+            self._cache.clear()
+            self._weight_rows[u].pop(v, None)  # remove o peso junto com a aresta
     
     def isSucessor(self, u: int, v: int) -> bool:
         """
@@ -160,12 +176,7 @@ class AdjacencyMatrixGraph(AbstractGraph):
             IndexError: Se o índice for inválido
         """
         self._validate_vertex(u)
-        
-        in_degree = 0
-        for i in range(self._num_vertices):
-            if self._matrix[i][u]:
-                in_degree += 1
-        return in_degree
+        return self._matrix_t[u].count(1)
     
     def getVertexOutDegree(self, u: int) -> int:
         """
@@ -181,12 +192,45 @@ class AdjacencyMatrixGraph(AbstractGraph):
             IndexError: Se o índice for inválido
         """
         self._validate_vertex(u)
+        return self._matrix[u].count(1)
+    
+    def setEdgeWeight(self, u: int, v: int, w: float) -> None:
+        """
+        Define o peso da aresta (u,v), armazenado na linha de pesos de u.
         
-        out_degree = 0
-        for j in range(self._num_vertices):
-            if self._matrix[u][j]:
-                out_degree += 1
-        return out_degree
+        Args:
+            u: Vértice origem
+            v: Vértice destino
+            w: Peso da aresta
+            
+        Raises:
+            IndexError: Se algum índice for inválido
+            ValueError: Se a aresta não existir
+        """
+        self._validate_vertices(u, v)
+        if not self._matrix[u][v]:
+            raise ValueError(f"Aresta ({u},{v}) não existe")
+        self._weight_rows[u][v] = w
+    
+    def getEdgeWeight(self, u: int, v: int) -> float:
+        """
+        Retorna o peso da aresta (u,v).
+        
+        Args:
+            u: Vértice origem
+            v: Vértice destino
+            
+        Returns:
+            Peso da aresta (1.0 se não definido)
+            
+        Raises:
+            IndexError: Se algum índice for inválido
+            ValueError: Se a aresta não existir
+        """
+        self._validate_vertices(u, v)
+        if not self._matrix[u][v]:
+            raise ValueError(f"Aresta ({u},{v}) não existe")
+        return self._weight_rows[u].get(v, 1.0)
     
     def isConnected(self) -> bool:
         """
@@ -198,30 +242,40 @@ class AdjacencyMatrixGraph(AbstractGraph):
         Returns:
             True se o grafo é conectado
         """
-        if self._num_vertices <= 1:
-            return True
-            
-        # DFS a partir do vértice 0
-        visited = [False] * self._num_vertices
-        self._dfs_connected(0, visited)
-        
-        # Verifica se todos os vértices foram visitados
-        return all(visited)
+        # O resultado fica em cache até a próxima alteração nas arestas
+        return self._cached('connected', self._compute_connected)
     
-    def _dfs_connected(self, vertex: int, visited: List[bool]) -> None:
+    def _compute_connected(self) -> bool:
         """
-        DFS auxiliar para verificação de conectividade.
+        DFS iterativa de conectividade fraca sobre a matriz e sua transposta.
         
-        Args:
-            vertex: Vértice atual
-            visited: Lista de vértices visitados
+        Returns:
+            True se todos os vértices são alcançáveis a partir do vértice 0
         """
-        visited[vertex] = True
+        if self._num_vertices <= 1:
+            return True
         
-        # Visita todos os vizinhos (considerando grafo não-direcionado)
-        for i in range(self._num_vertices):
-            if not visited[i] and (self._matrix[vertex][i] or self._matrix[i][vertex]):
-                self._dfs_connected(i, visited)
+        # DFS iterativa a partir do vértice 0, seguindo a linha (sucessores)
+        # e a linha da transposta (predecessores) de cada vértice
+        visited = bytearray(self._num_vertices)
+        visited[0] = 1
+        visited_count = 1
+        stack = [0]
+        
+        while stack:
+            vertex = stack.pop()
+            for row in (self._matrix[vertex], self._matrix_t[vertex]):
+                # bytearray.find localiza a próxima célula marcada em C
+                neighbor = row.find(1)
+                while neighbor != -1:
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        visited_count += 1
+                        stack.append(neighbor)
+                    neighbor = row.find(1, neighbor + 1)
+        
+        # Verifica se todos os vértices foram visitados
+        return visited_count == self._num_vertices
     
     # =================================================================
     # MÉTODOS AUXILIARES
@@ -251,11 +305,26 @@ class AdjacencyMatrixGraph(AbstractGraph):
             
         return result
     
+    def _iter_edges(self) -> Iterator[Tuple[int, int, float]]:
+        """
+        Percorre as arestas linha a linha, localizando as células marcadas
+        com bytearray.find.
+        
+        Yields:
+            Triplas (origem, destino, peso) em ordem crescente
+        """
+        for u, row in enumerate(self._matrix):
+            weights = self._weight_rows[u]
+            v = row.find(1)
+            while v != -1:
+                yield u, v, weights.get(v, 1.0)
+                v = row.find(1, v + 1)
+    
     def getAdjacencyMatrix(self) -> List[List[bool]]:
         """
         Retorna cópia da matriz de adjacência.
         
         Returns:
-            Matriz de adjacência como lista de listas
+            Matriz de adjacência como lista de listas de bool
         """
-        return [row[:] for row in self._matrix]
\ No newline at end of file
+        return [[cell == 1 for cell in row] for row in self._matrix]
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Kernels de conectividade
+Trabalho de Teoria dos Grafos - Etapa 2
+
+Funções escritas apenas com laços e indexação sobre listas, sem recursão
+nem objetos auxiliares por vértice.
+"""
+
+
+def weak_connected_union_find(neighbor_lists, num_vertices: int) -> bool:
+    """
+    Verifica conectividade fraca com Union-Find em uma única passada pelas arestas.
+    
+    Cada aresta (u, v) une os componentes de u e v; o grafo é fracamente
+    conectado quando resta um único componente. Não precisa das listas de
+    predecessores.
+    
+    Args:
+        neighbor_lists: Sucessores de cada vértice, na ordem 0..n-1
+        num_vertices: Número de vértices
+        
+    Returns:
+        True se o grafo é fracamente conectado
+    """
+    components = num_vertices
+    if components <= 1:
+        return True
+    
+    parent = list(range(num_vertices))
+    for vertex, neighbors in enumerate(neighbor_lists):
+        for neighbor in neighbors:
+            # Busca das raízes com compressão de caminho (halving)
+            root_u = vertex
+            while parent[root_u] != root_u:
+                parent[root_u] = parent[parent[root_u]]
+                root_u = parent[root_u]
+            root_v = neighbor
+            while parent[root_v] != root_v:
+                parent[root_v] = parent[parent[root_v]]
+                root_v = parent[root_v]
+            
+            if root_u != root_v:
+                parent[root_v] = root_u
+                components -= 1
+                if components == 1:
+                    return True
+    
+    return False
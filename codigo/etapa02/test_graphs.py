@@ -230,6 +230,27 @@ class TestGraphImplementations(unittest.TestCase):
                 # Conecta os componentes
                 graph.addEdge(1, 2)
                 self.assertTrue(graph.isConnected())
+                
+                # Remoção invalida o resultado em cache
+                graph.removeEdge(1, 2)
+                self.assertFalse(graph.isConnected())
+    
+    def test_add_edges_from(self):
+        """Testa inserção de arestas em lote."""
+        for name, graph_class in self.implementations:
+            with self.subTest(implementation=name):
+                graph = graph_class.fromEdges(4, [(0, 1), (1, 2), (0, 1), (2, 3)])
+                self.assertEqual(graph.getEdgeCount(), 3)
+                self.assertTrue(graph.hasEdge(2, 3))
+                self.assertEqual(graph.getVertexInDegree(1), 1)
+                self.assertTrue(graph.isConnected())
+                
+                # Aresta inválida no lote não altera o grafo
+                with self.assertRaises(IndexError):
+                    graph.addEdgesFrom([(3, 0), (0, 4)])
+                with self.assertRaises(ValueError):
+                    graph.addEdgesFrom([(3, 0), (1, 1)])
+                self.assertFalse(graph.hasEdge(3, 0))
     
     def test_gephi_export(self):
         """Testa exportação para Gephi."""
@@ -289,6 +310,24 @@ class TestSpecificImplementations(unittest.TestCase):
         self.assertEqual(adj_list[0], {1, 2})
         self.assertEqual(adj_list[1], set())
         self.assertEqual(adj_list[2], set())
+        
+        # Views não copiam e refletem alterações posteriores
+        successors_view = graph.getSuccessorsView(0)
+        predecessors_view = graph.getPredecessorsView(2)
+        graph.removeEdge(0, 2)
+        self.assertEqual(successors_view, {1})
+        self.assertEqual(set(predecessors_view), set())
+        with self.assertRaises(TypeError):
+            adj_list[0] = {2}
+        
+        # Representação CSR
+        graph.addEdge(2, 0)
+        indptr, indices = graph.freeze()
+        self.assertEqual(list(indptr), [0, 1, 1, 2])
+        self.assertEqual(list(indices), [1, 0])
+        self.assertIs(graph.freeze(), graph.freeze())
+        graph.addEdge(1, 2)
+        self.assertEqual(list(graph.freeze()[1]), [1, 2, 0])
 
 if __name__ == '__main__':
     # Executa os testes
@@ -7,9 +7,15 @@ Análise completa da rede de colaboração do repositório mmdetection.
 
 import os
 import sys
-import json
+import heapq
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
 
+# Os gráficos são apenas salvos em arquivo (inclusive em processos filhos)
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
 # Adiciona diretório src ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -57,6 +63,11 @@ def main():
     graph = loader.build_collaboration_graph(data)
     user_mapping = loader.get_user_mapping()
     
+    # IDs são densos (0..n-1): nomes indexados diretamente por ID
+    user_names = np.empty(graph.getVertexCount(), dtype=object)
+    for user_id, username in user_mapping.items():
+        user_names[user_id] = username
+    
     if graph.getVertexCount() == 0:
         print("❌ ERRO: Grafo vazio!")
         return
@@ -80,10 +91,9 @@ def main():
     # Métricas da rede
     print("   📊 Calculando métricas da rede...")
     
-    # Calcula grau médio manualmente
-    total_degree = sum(graph.getVertexInDegree(v) + graph.getVertexOutDegree(v) 
-                      for v in range(graph.getVertexCount()))
-    average_degree = total_degree / graph.getVertexCount() if graph.getVertexCount() > 0 else 0
+    # Grau médio a partir dos vetores de grau do grafo
+    total_degree = graph.getInDegrees() + graph.getOutDegrees()
+    average_degree = float(total_degree.mean()) if graph.getVertexCount() > 0 else 0
     
     network_metrics = {
         'vertex_count': graph.getVertexCount(),
@@ -107,96 +117,113 @@ def main():
     print("-" * 50)
     
     visualizer = GraphVisualizer(output_dir)
-    
-    # Gráfico de comparação de centralidades
-    visualizer.plot_centrality_comparison(
-        centrality_results, user_mapping, 
-        save_path="centralidade_comparacao.png"
-    )
-    
-    # Gráfico de métricas da rede  
-    visualizer.plot_network_metrics(
-        network_metrics,
-        save_path="metricas_rede.png"
-    )
-    
-    # Distribuição de graus
-    visualizer.plot_degree_distribution(
-        graph, user_mapping,
-        save_path="distribuicao_graus.png"
-    )
-    
-    # Análise comunitária
-    visualizer.plot_community_analysis(
-        community_metrics,
-        save_path="analise_comunidades.png"
-    )
-    
-    # NOVOS GRÁFICOS ESPECÍFICOS PARA GRAFOS DIRECIONADOS
-    print("   📊 Gerando visualizações específicas para grafos direcionados...")
-    
-    # Estrutura do grafo direcionado
-    visualizer.plot_directed_graph_structure(
-        graph, user_mapping, centrality_results,
-        save_path="grafo_direcionado.png"
-    )
-    
-    # Detecção detalhada de comunidades e bridging ties
-    visualizer.plot_community_detection_detailed(
-        graph, analyzer, user_mapping,
-        save_path="deteccao_comunidades.png"
-    )
-    
-    # Análise de fluxo direcionado
-    visualizer.plot_directed_flow_analysis(
-        graph, user_mapping, centrality_results,
-        save_path="analise_fluxo_direcionado.png"
-    )
-    
-    # NOVOS GRÁFICOS DE REDE VISUAL
-    print("   🎨 Gerando visualizações da estrutura da rede...")
-    
-    # Obtém comunidades para visualização
-    communities = analyzer._detect_simple_communities()
-    
-    # Visualização manual do grafo da rede
-    visualizer.plot_network_graph_manual(
-        graph, user_mapping, centrality_results, communities,
-        save_path="rede_grafo_manual.png"
-    )
-    
-    # Análise detalhada de bridging ties
-    visualizer.plot_bridging_ties_analysis(
-        graph, analyzer, user_mapping,
-        save_path="bridging_ties_detalhado.png"
-    )
-    
-    # 5. RELATÓRIOS
-    print("\n🔄 5. GERANDO RELATÓRIOS...")
-    print("-" * 50)
-    
-    # Resultados completos
-    complete_results = {
-        'centrality': centrality_results,
-        'network_metrics': network_metrics,
-        'community_metrics': community_metrics,
-        'metadata': {
-            'total_users': len(user_mapping),
-            'data_files_loaded': list(data.keys()),
-            'total_records_processed': total_records
+    visualizer.set_centrality_data(centrality_results)
+    
+    # Os gráficos são independentes: cada um é gerado em um processo
+    # separado enquanto o processo principal segue para os relatórios
+    with ProcessPoolExecutor(max_workers=min(6, os.cpu_count() or 1)) as pool:
+        plot_jobs = []
+        
+        # Gráfico de comparação de centralidades
+        plot_jobs.append(pool.submit(
+            visualizer.plot_centrality_comparison,
+            centrality_results, user_mapping, 
+            save_path="centralidade_comparacao.png"
+        ))
+        
+        # Gráfico de métricas da rede  
+        plot_jobs.append(pool.submit(
+            visualizer.plot_network_metrics,
+            network_metrics,
+            save_path="metricas_rede.png"
+        ))
+        
+        # Distribuição de graus
+        plot_jobs.append(pool.submit(
+            visualizer.plot_degree_distribution,
+            graph, user_mapping,
+            save_path="distribuicao_graus.png"
+        ))
+        
+        # Análise comunitária
+        plot_jobs.append(pool.submit(
+            visualizer.plot_community_analysis,
+            community_metrics,
+            save_path="analise_comunidades.png"
+        ))
+        
+        # NOVOS GRÁFICOS ESPECÍFICOS PARA GRAFOS DIRECIONADOS
+        print("   📊 Gerando visualizações específicas para grafos direcionados...")
+        
+        # Estrutura do grafo direcionado
+        plot_jobs.append(pool.submit(
+            visualizer.plot_directed_graph_structure,
+            graph, user_mapping, centrality_results,
+            save_path="grafo_direcionado.png"
+        ))
+        
+        # Detecção detalhada de comunidades e bridging ties
+        plot_jobs.append(pool.submit(
+            visualizer.plot_community_detection_detailed,
+            graph, analyzer, user_mapping,
+            save_path="deteccao_comunidades.png"
+        ))
+        
+        # Análise de fluxo direcionado
+        plot_jobs.append(pool.submit(
+            visualizer.plot_directed_flow_analysis,
+            graph, user_mapping, centrality_results,
+            save_path="analise_fluxo_direcionado.png"
+        ))
+        
+        # NOVOS GRÁFICOS DE REDE VISUAL
+        print("   🎨 Gerando visualizações da estrutura da rede...")
+        
+        # Obtém comunidades para visualização
+        communities = analyzer._detect_simple_communities()
+        
+        # Visualização manual do grafo da rede
+        plot_jobs.append(pool.submit(
+            visualizer.plot_network_graph_manual,
+            graph, user_mapping, centrality_results, communities,
+            save_path="rede_grafo_manual.png"
+        ))
+        
+        # Análise detalhada de bridging ties
+        plot_jobs.append(pool.submit(
+            visualizer.plot_bridging_ties_analysis,
+            graph, analyzer, user_mapping, centrality_results,
+            save_path="bridging_ties_detalhado.png"
+        ))
+        
+        # 5. RELATÓRIOS
+        print("\n🔄 5. GERANDO RELATÓRIOS...")
+        print("-" * 50)
+        
+        # Resultados completos
+        complete_results = {
+            'centrality': centrality_results,
+            'network_metrics': network_metrics,
+            'community_metrics': community_metrics,
+            'metadata': {
+                'total_users': len(user_mapping),
+                'data_files_loaded': list(data.keys()),
+                'total_records_processed': total_records
+            }
         }
-    }
-    
-    # Salva resultados completos
-    results_path = os.path.join(output_dir, "resultados_completos.json")
-    with open(results_path, 'w', encoding='utf-8') as f:
-        json.dump(complete_results, f, indent=2, ensure_ascii=False)
-    
-    # Relatório resumo
-    summary_report = visualizer.create_summary_report(
-        complete_results, user_mapping,
-        save_path="relatorio_resumo.json"
-    )
+        
+        # Salva resultados completos
+        visualizer.save_json(complete_results, "resultados_completos.json")
+        
+        # Relatório resumo (derivado do mesmo dicionário em memória)
+        summary_report = visualizer.create_summary_report(
+            complete_results, user_mapping,
+            save_path="relatorio_resumo.json"
+        )
+        
+        # Aguarda os gráficos (propaga eventuais erros dos processos filhos)
+        for job in plot_jobs:
+            job.result()
     
     # 6. RESUMO EXECUTIVO
     print("\n🔄 6. RESUMO EXECUTIVO...")
@@ -216,10 +243,10 @@ def main():
     # Top 5 usuários por centralidade
     print(f"\n⭐ TOP 5 DESENVOLVEDORES (por centralidade de grau):")
     degree_centrality = centrality_results['degree_centrality']
-    top_users = sorted(degree_centrality.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_users = heapq.nlargest(5, degree_centrality.items(), key=lambda x: x[1])
     
     for i, (user_id, centrality) in enumerate(top_users, 1):
-        username = user_mapping.get(int(user_id), f"user_{user_id}")
+        username = user_names[user_id] or f"user_{user_id}"
         print(f"   {i}. {username} (centralidade: {centrality:.4f})")
     
     # Insights automáticos
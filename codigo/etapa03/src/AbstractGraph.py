@@ -36,6 +36,8 @@ class AbstractGraph(ABC):
         self._vertex_labels: Dict[int, str] = {}
         self._vertex_weights: Dict[int, float] = {}
         self._edge_weights: Dict[tuple, float] = {}
+        # Versão do grafo: incrementada a cada alteração de arestas ou pesos
+        self._version = 0
         
     def _validate_vertex(self, vertex: int) -> None:
         """
@@ -235,6 +237,7 @@ class AbstractGraph(ABC):
         if not self.hasEdge(u, v):
             raise ValueError(f"Aresta ({u},{v}) não existe")
         self._edge_weights[(u, v)] = w
+        self._version += 1
     
     def getEdgeWeight(self, u: int, v: int) -> float:
         """
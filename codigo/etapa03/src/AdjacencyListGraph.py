@@ -5,14 +5,20 @@ Trabalho de Teoria dos Grafos - Etapa 2/3
 Implementação da API utilizando listas de adjacência.
 """
 
-from typing import Dict, List, Set
+from types import MappingProxyType
+from typing import AbstractSet, Dict, Mapping, Set, Tuple
+
+import numpy as np
+
 from .AbstractGraph import AbstractGraph
 
 class AdjacencyListGraph(AbstractGraph):
     """
     Implementação de grafo usando listas de adjacência.
     
-    Cada vértice mantém um conjunto (set) de seus sucessores.
+    Cada vértice mantém um conjunto (set) de seus sucessores. Depois da
+    construção, freeze() compacta as listas em CSR (indptr/indices) para
+    as fases de análise, que só fazem leitura.
     """
     
     def __init__(self, num_vertices: int):
@@ -31,6 +37,71 @@ class AdjacencyListGraph(AbstractGraph):
         self._adj_list: Dict[int, Set[int]] = {
             i: set() for i in range(num_vertices)
         }
+        self._edge_count = 0
+        
+        # Representação CSR, válida apenas enquanto o grafo está congelado
+        self._indptr: np.ndarray = None
+        self._indices: np.ndarray = None
+        self._frozen = False
+        
+        # Adjacência reversa (predecessores), construída sob demanda
+        self._rev_adj: Dict[int, Set[int]] = None
+        self._in_degrees: np.ndarray = None
+    
+    def freeze(self) -> None:
+        """
+        Compacta as listas de adjacência em CSR (Compressed Sparse Row).
+        
+        Os sucessores de u ficam ordenados em indices[indptr[u]:indptr[u+1]].
+        Qualquer alteração posterior de arestas descarta a CSR.
+        """
+        n = self._num_vertices
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        indptr[1:] = np.cumsum([len(self._adj_list[i]) for i in range(n)])
+        self._indices = np.fromiter(
+            (v for u in range(n) for v in sorted(self._adj_list[u])),
+            dtype=np.int32, count=int(indptr[-1])
+        )
+        self._indptr = indptr
+        self._in_degrees = np.bincount(self._indices, minlength=n).astype(np.int32)
+        self._frozen = True
+    
+    def _rebuild_rev(self) -> None:
+        """Constrói a adjacência reversa em uma única passada pelas arestas."""
+        rev = {i: set() for i in range(self._num_vertices)}
+        for u, successors in self._adj_list.items():
+            for v in successors:
+                rev[v].add(u)
+        self._rev_adj = rev
+    
+    def _unfreeze(self) -> None:
+        """Descarta a CSR após uma alteração nas arestas."""
+        self._indptr = None
+        self._indices = None
+        self._in_degrees = None
+        self._frozen = False
+    
+    def getSuccessorsArray(self, u: int) -> np.ndarray:
+        """
+        Retorna os sucessores de u como fatia (sem cópia) da CSR.
+        
+        Raises:
+            IndexError: Se o índice for inválido
+        """
+        self._validate_vertex(u)
+        if not self._frozen:
+            self.freeze()
+        return self._indices[self._indptr[u]:self._indptr[u + 1]]
+    
+    def getCSR(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna os vetores (indptr, indices) da CSR, congelando se preciso.
+        
+        Os vetores são internos ao grafo: não devem ser modificados.
+        """
+        if not self._frozen:
+            self.freeze()
+        return self._indptr, self._indices
     
     def getVertexCount(self) -> int:
         """Retorna o número de vértices do grafo."""
@@ -38,10 +109,7 @@ class AdjacencyListGraph(AbstractGraph):
     
     def getEdgeCount(self) -> int:
         """Retorna o número de arestas do grafo."""
-        edge_count = 0
-        for vertex in self._adj_list:
-            edge_count += len(self._adj_list[vertex])
-        return edge_count
+        return self._edge_count
     
     def hasEdge(self, u: int, v: int) -> bool:
         """Verifica se existe aresta entre u e v."""
@@ -52,12 +120,67 @@ class AdjacencyListGraph(AbstractGraph):
         """Adiciona aresta entre u e v (operação idempotente)."""
         self._validate_vertices(u, v)
         self._validate_no_self_loop(u, v)
-        self._adj_list[u].add(v)
+        if v not in self._adj_list[u]:
+            self._adj_list[u].add(v)
+            self._edge_count += 1
+            self._version += 1
+            if self._rev_adj is not None:
+                self._rev_adj[v].add(u)
+            if self._frozen:
+                self._unfreeze()
+    
+    def addEdges(self, us, vs, weights=None) -> None:
+        """
+        Adiciona arestas em lote (u[i], v[i]), com pesos opcionais.
+        
+        Valida todo o lote de uma vez, com operações vetorizadas, antes de
+        inserir qualquer aresta: um lote inválido não altera o grafo.
+        
+        Args:
+            us: Vértices de origem
+            vs: Vértices de destino
+            weights: Pesos das arestas (opcional)
+            
+        Raises:
+            IndexError: Se algum índice for inválido
+            ValueError: Se houver laço ou tamanhos diferentes
+        """
+        us = np.asarray(us, dtype=np.int64)
+        vs = np.asarray(vs, dtype=np.int64)
+        if us.shape != vs.shape or (weights is not None and len(weights) != len(us)):
+            raise ValueError("Lote de arestas com tamanhos diferentes")
+        n = self._num_vertices
+        if ((us < 0) | (us >= n) | (vs < 0) | (vs >= n)).any():
+            raise IndexError(f"Índice de vértice inválido no lote. Deve estar entre 0 e {n-1}")
+        if (us == vs).any():
+            raise ValueError("Grafos simples não permitem laços (self-loops)")
+        
+        if self._frozen:
+            self._unfreeze()
+        adj = self._adj_list
+        for u, v in zip(us.tolist(), vs.tolist()):
+            successors = adj[u]
+            if v not in successors:
+                successors.add(v)
+                self._edge_count += 1
+                if self._rev_adj is not None:
+                    self._rev_adj[v].add(u)
+        if weights is not None:
+            for u, v, w in zip(us.tolist(), vs.tolist(), weights):
+                self._edge_weights[(u, v)] = w
+        self._version += 1
     
     def removeEdge(self, u: int, v: int) -> None:
         """Remove aresta entre u e v."""
         self._validate_vertices(u, v)
-        self._adj_list[u].discard(v)
+        if v in self._adj_list[u]:
+            self._adj_list[u].remove(v)
+            self._edge_count -= 1
+            self._version += 1
+            if self._rev_adj is not None:
+                self._rev_adj[v].discard(u)
+            if self._frozen:
+                self._unfreeze()
         if (u, v) in self._edge_weights:
             del self._edge_weights[(u, v)]
     
@@ -72,50 +195,83 @@ class AdjacencyListGraph(AbstractGraph):
     def getVertexInDegree(self, u: int) -> int:
         """Retorna o grau de entrada do vértice u."""
         self._validate_vertex(u)
-        in_degree = 0
-        for vertex in self._adj_list:
-            if u in self._adj_list[vertex]:
-                in_degree += 1
-        return in_degree
+        if self._frozen:
+            return int(self._in_degrees[u])
+        if self._rev_adj is None:
+            self._rebuild_rev()
+        return len(self._rev_adj[u])
+    
+    def getInDegrees(self) -> np.ndarray:
+        """Retorna o vetor de graus de entrada de todos os vértices."""
+        if not self._frozen:
+            self.freeze()
+        return self._in_degrees
+    
+    def getOutDegrees(self) -> np.ndarray:
+        """Retorna o vetor de graus de saída de todos os vértices."""
+        if not self._frozen:
+            self.freeze()
+        return np.diff(self._indptr)
     
     def getVertexOutDegree(self, u: int) -> int:
         """Retorna o grau de saída do vértice u."""
         self._validate_vertex(u)
+        if self._frozen:
+            return int(self._indptr[u + 1] - self._indptr[u])
         return len(self._adj_list[u])
     
     def isConnected(self) -> bool:
-        """Verifica se o grafo é conectado usando DFS."""
-        if self._num_vertices <= 1:
+        """Verifica se o grafo é (fracamente) conectado usando DFS iterativa."""
+        n = self._num_vertices
+        if n <= 1:
             return True
-        visited = [False] * self._num_vertices
-        self._dfs_connected(0, visited)
-        return all(visited)
-    
-    def _dfs_connected(self, vertex: int, visited: List[bool]) -> None:
-        """DFS auxiliar para verificação de conectividade."""
-        visited[vertex] = True
-        for successor in self._adj_list[vertex]:
-            if not visited[successor]:
-                self._dfs_connected(successor, visited)
-        for v in range(self._num_vertices):
-            if not visited[v] and vertex in self._adj_list[v]:
-                self._dfs_connected(v, visited)
+        if self._rev_adj is None:
+            self._rebuild_rev()
+        visited = bytearray(n)
+        stack = [0]
+        while stack:
+            u = stack.pop()
+            if visited[u]:
+                continue
+            visited[u] = 1
+            stack.extend(self._adj_list[u])
+            stack.extend(self._rev_adj[u])
+        return 0 not in visited
     
     def getSuccessors(self, u: int) -> Set[int]:
-        """Retorna os sucessores do vértice u."""
+        """Retorna os sucessores do vértice u (cópia, pode ser modificada)."""
         self._validate_vertex(u)
         return self._adj_list[u].copy()
     
+    def getSuccessorsView(self, u: int) -> AbstractSet[int]:
+        """
+        Retorna os sucessores do vértice u sem copiar.
+        
+        Somente leitura: o conjunto retornado é o interno do grafo e
+        reflete alterações posteriores. Para laços de análise.
+        """
+        self._validate_vertex(u)
+        return self._adj_list[u]
+    
     def getPredecessors(self, u: int) -> Set[int]:
         """Retorna os predecessores do vértice u."""
         self._validate_vertex(u)
-        predecessors = set()
-        for vertex in self._adj_list:
-            if u in self._adj_list[vertex]:
-                predecessors.add(vertex)
-        return predecessors
-    
-    def getAdjacencyList(self) -> Dict[int, Set[int]]:
-        """Retorna cópia das listas de adjacência."""
-        return {vertex: self._adj_list[vertex].copy() 
-                for vertex in self._adj_list}
\ No newline at end of file
+        if self._rev_adj is None:
+            self._rebuild_rev()
+        return self._rev_adj[u].copy()
+    
+    def getPredecessorsView(self, u: int) -> AbstractSet[int]:
+        """
+        Retorna os predecessores do vértice u sem copiar.
+        
+        Somente leitura, como getSuccessorsView.
+        """
+        self._validate_vertex(u)
+        if self._rev_adj is None:
+            self._rebuild_rev()
+        return self._rev_adj[u]
+    
+    def getAdjacencyList(self) -> Mapping[int, AbstractSet[int]]:
+        """Retorna visão somente leitura das listas de adjacência."""
+        return MappingProxyType({vertex: frozenset(successors)
+                                 for vertex, successors in self._adj_list.items()})
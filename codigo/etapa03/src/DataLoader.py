@@ -203,12 +203,14 @@ class DataLoader:
             if pr_author and merged_by and pr_author != merged_by:
                 add_edge_weight(merged_by, pr_author, 5)  # Merge
         
-        # Adiciona arestas ao grafo com pesos
-        total_edges = 0
-        for (from_id, to_id), weight in edge_weights.items():
-            graph.addEdge(from_id, to_id)
-            graph.setEdgeWeight(from_id, to_id, weight)
-            total_edges += 1
+        # Adiciona arestas ao grafo com pesos (em lote)
+        from_ids = [from_id for from_id, _ in edge_weights]
+        to_ids = [to_id for _, to_id in edge_weights]
+        graph.addEdges(from_ids, to_ids, list(edge_weights.values()))
+        total_edges = len(edge_weights)
+        
+        # Grafo pronto: compacta em CSR para as análises (somente leitura)
+        graph.freeze()
         
         print(f"📊 Grafo construído:")
         print(f"   - Vértices: {graph.getVertexCount()}")
@@ -4,12 +4,37 @@ Trabalho de Teoria dos Grafos - Etapa 3
 
 Implementa TODOS os algoritmos de análise de grafos DO ZERO.
 Sem usar bibliotecas prontas para análise de grafos.
-Apenas estruturas básicas do Python.
+Apenas estruturas básicas do Python e vetores NumPy.
 """
 
-from typing import Dict, List, Tuple, Set
+import random
+from collections import deque
+from functools import wraps
+from typing import Dict, List, Optional, Tuple, Set
+
+import numpy as np
+
 from .AbstractGraph import AbstractGraph
 
+def _memoized(method):
+    """
+    Memoiza o resultado de uma métrica enquanto o grafo não for alterado.
+    
+    A chave inclui o nome do método e os argumentos; o cache inteiro é
+    descartado quando a versão do grafo muda.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        version = getattr(self.graph, '_version', None)
+        if version != self._cache_version:
+            self._cache.clear()
+            self._cache_version = version
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._cache:
+            self._cache[key] = method(self, *args, **kwargs)
+        return self._cache[key]
+    return wrapper
+
 class GraphAnalyzer:
     """
     Classe para análise de grafos implementada completamente do zero.
@@ -25,6 +50,10 @@ class GraphAnalyzer:
         """
         self.graph = graph
         self.num_vertices = graph.getVertexCount() if graph else 0
+        
+        # Resultados memoizados, válidos para a versão atual do grafo
+        self._cache: Dict[tuple, object] = {}
+        self._cache_version = None
     
     # =================================================================
     # ALGORITMOS DE BUSCA (BASE PARA OUTRAS MÉTRICAS)
@@ -33,34 +62,61 @@ class GraphAnalyzer:
     def _bfs_distances(self, start: int) -> Dict[int, int]:
         """
         Busca em largura para calcular distâncias.
-        Implementado do zero usando lista como fila.
+        Implementado do zero com deque sobre as listas de sucessores.
         
         Args:
             start: Vértice inicial
             
         Returns:
-            Dicionário {vértice: distância}
+            Dicionário {vértice: distância} (apenas vértices alcançados)
         """
+        successors = self._successor_lists()
         distances = {start: 0}
-        queue = [start]  # Fila simples com lista
+        queue = deque([start])
         
         while queue:
-            current = queue.pop(0)  # Remove do início (FIFO)
+            current = queue.popleft()
+            next_distance = distances[current] + 1
             
-            # Pega sucessores do vértice atual
-            successors = self.graph.getSuccessors(current)
-            
-            for neighbor in successors:
+            for neighbor in successors[current]:
                 if neighbor not in distances:
-                    distances[neighbor] = distances[current] + 1
+                    distances[neighbor] = next_distance
                     queue.append(neighbor)
         
         return distances
     
+    @_memoized
+    def _successor_lists(self) -> List[List[int]]:
+        """
+        Listas de sucessores de todos os vértices, extraídas da CSR.
+        
+        Returns:
+            Lista indexada por vértice com os sucessores (ordenados)
+        """
+        return [self.graph.getSuccessorsArray(v).tolist()
+                for v in range(self.num_vertices)]
+    
+    @_memoized
+    def _edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Arestas da CSR como vetores paralelos (origem, destino) e graus de saída.
+        
+        Permitem o produto A^T·x de uma iteração de potência com
+        np.bincount, sem laços Python por vértice.
+        
+        Returns:
+            (sources, targets, out_degrees)
+        """
+        indptr, targets = self.graph.getCSR()
+        out_degrees = np.diff(indptr)
+        sources = np.repeat(np.arange(self.num_vertices), out_degrees)
+        return sources, targets, out_degrees
+    
     # =================================================================
     # MÉTRICAS DE CENTRALIDADE - IMPLEMENTADAS DO ZERO
     # =================================================================
     
+    @_memoized
     def calculate_degree_centrality(self) -> Dict[int, float]:
         """
         Centralidade de grau implementada do zero.
@@ -85,86 +141,122 @@ class GraphAnalyzer:
         
         return centrality
     
-    def calculate_betweenness_centrality(self) -> Dict[int, float]:
+    @_memoized
+    def calculate_betweenness_centrality(self, sample_k: Optional[int] = None,
+                                         seed: Optional[int] = None) -> Dict[int, float]:
         """
         Centralidade de intermediação implementada do zero.
-        Algoritmo de Brandes simplificado.
+        Algoritmo de Brandes sobre listas de sucessores da CSR.
+        
+        Args:
+            sample_k: Se informado (< n), usa apenas k origens sorteadas e
+                      reescala por n/k (aproximação); None = exato
+            seed: Semente do sorteio das origens (resultado reprodutível)
         
         Returns:
             Dicionário {vértice: centralidade_intermediacao}
         """
-        centrality = {v: 0.0 for v in range(self.num_vertices)}
-        
-        for s in range(self.num_vertices):
-            # Inicialização
-            stack = []
-            predecessors = {v: [] for v in range(self.num_vertices)}
-            distances = {v: -1 for v in range(self.num_vertices)}
-            sigma = {v: 0 for v in range(self.num_vertices)}
-            delta = {v: 0.0 for v in range(self.num_vertices)}
-            
+        n = self.num_vertices
+        successors = self._successor_lists()
+        centrality = [0.0] * n
+        
+        sources = range(n)
+        scale = 1.0
+        if sample_k is not None and 0 < sample_k < n:
+            sources = random.Random(seed).sample(range(n), sample_k)
+            scale = n / sample_k
+        
+        # Vetores indexados por vértice, reinicializados por origem
+        distances = [-1] * n
+        sigma = [0] * n
+        delta = [0.0] * n
+        predecessors: List[List[int]] = [[] for _ in range(n)]
+        
+        for s in sources:
             # BFS modificada
+            stack = []
             distances[s] = 0
             sigma[s] = 1
-            queue = [s]
+            queue = deque([s])
             
             while queue:
-                v = queue.pop(0)
+                v = queue.popleft()
                 stack.append(v)
+                next_distance = distances[v] + 1
                 
-                successors = self.graph.getSuccessors(v)
-                for w in successors:
+                for w in successors[v]:
                     # Primeira vez encontrando w?
                     if distances[w] < 0:
                         queue.append(w)
-                        distances[w] = distances[v] + 1
+                        distances[w] = next_distance
                     
                     # Caminho mínimo até w através de v?
-                    if distances[w] == distances[v] + 1:
+                    if distances[w] == next_distance:
                         sigma[w] += sigma[v]
                         predecessors[w].append(v)
             
-            # Acumulação
+            # Acumulação (e limpeza apenas dos vértices visitados)
             while stack:
                 w = stack.pop()
+                coefficient = (1 + delta[w]) / sigma[w]
                 for v in predecessors[w]:
-                    delta[v] += (sigma[v] / sigma[w]) * (1 + delta[w])
+                    delta[v] += sigma[v] * coefficient
                 if w != s:
                     centrality[w] += delta[w]
+                distances[w] = -1
+                sigma[w] = 0
+                delta[w] = 0.0
+                predecessors[w] = []
         
         # Normalização
-        n = self.num_vertices
         norm_factor = 2.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+        norm_factor *= scale
         
-        for v in centrality:
-            centrality[v] *= norm_factor
-        
-        return centrality
+        return {v: centrality[v] * norm_factor for v in range(n)}
     
-    def calculate_closeness_centrality(self) -> Dict[int, float]:
+    @_memoized
+    def compute_distance_derived_metrics(self) -> Dict[str, Dict[int, float]]:
         """
-        Centralidade de proximidade implementada do zero.
+        Proximidade, afastamento (farness) e excentricidade em uma única
+        varredura: uma BFS por origem alimenta as três métricas.
+        
+        Considera apenas os vértices alcançáveis a partir de cada origem.
         
         Returns:
-            Dicionário {vértice: centralidade_proximidade}
+            Dicionário {'closeness'|'farness'|'eccentricity': {vértice: valor}}
         """
-        centrality = {}
+        closeness = {}
+        farness = {}
+        eccentricity = {}
         
         for v in range(self.num_vertices):
             distances = self._bfs_distances(v)
             
-            # Remove vértices não alcançáveis
-            reachable_distances = [d for d in distances.values() if d > 0]
+            # Distância 0 é a própria origem
+            reachable = len(distances) - 1
+            total_distance = sum(distances.values())
             
-            if len(reachable_distances) > 0:
-                total_distance = sum(reachable_distances)
-                # Closeness = (n-1) / soma_distancias
-                centrality[v] = len(reachable_distances) / total_distance
-            else:
-                centrality[v] = 0.0
+            farness[v] = total_distance
+            eccentricity[v] = max(distances.values())
+            # Closeness = alcançáveis / soma_distancias
+            closeness[v] = reachable / total_distance if reachable > 0 else 0.0
+        
+        return {
+            'closeness': closeness,
+            'farness': farness,
+            'eccentricity': eccentricity
+        }
+    
+    def calculate_closeness_centrality(self) -> Dict[int, float]:
+        """
+        Centralidade de proximidade implementada do zero.
         
-        return centrality
+        Returns:
+            Dicionário {vértice: centralidade_proximidade}
+        """
+        return self.compute_distance_derived_metrics()['closeness']
     
+    @_memoized
     def calculate_pagerank(self, damping: float = 0.85, max_iterations: int = 100, tolerance: float = 1e-6) -> Dict[int, float]:
         """
         PageRank implementado do zero.
@@ -177,34 +269,32 @@ class GraphAnalyzer:
         Returns:
             Dicionário {vértice: pagerank}
         """
+        n = self.num_vertices
+        sources, targets, out_degrees = self._edge_arrays()
+        # 1/grau_saida de cada origem (vértices sem saída não contribuem)
+        inv_out = np.divide(1.0, out_degrees, out=np.zeros(n), where=out_degrees > 0)
+        
         # Inicialização
-        pagerank = {v: 1.0 / self.num_vertices for v in range(self.num_vertices)}
+        pagerank = np.full(n, 1.0 / n)
         
         for iteration in range(max_iterations):
-            new_pagerank = {}
+            # Soma contribuições dos predecessores: (A^T · (pr / grau_saida))
+            contributions = (pagerank * inv_out)[sources]
+            rank_sum = np.bincount(targets, weights=contributions, minlength=n)
             
-            for v in range(self.num_vertices):
-                rank_sum = 0.0
-                
-                # Soma contribuições dos predecessores
-                for u in range(self.num_vertices):
-                    if self.graph.hasEdge(u, v):
-                        out_degree = self.graph.getVertexOutDegree(u)
-                        if out_degree > 0:
-                            rank_sum += pagerank[u] / out_degree
-                
-                # Fórmula do PageRank
-                new_pagerank[v] = (1 - damping) / self.num_vertices + damping * rank_sum
+            # Fórmula do PageRank
+            new_pagerank = (1 - damping) / n + damping * rank_sum
             
             # Verifica convergência
-            diff = sum(abs(new_pagerank[v] - pagerank[v]) for v in range(self.num_vertices))
+            diff = np.abs(new_pagerank - pagerank).sum()
             if diff < tolerance:
                 break
             
             pagerank = new_pagerank
         
-        return pagerank
+        return dict(enumerate(pagerank.tolist()))
     
+    @_memoized
     def calculate_eigenvector_centrality(self, max_iterations: int = 100, tolerance: float = 1e-6) -> Dict[int, float]:
         """
         Centralidade de autovetor implementada do zero.
@@ -217,34 +307,30 @@ class GraphAnalyzer:
         Returns:
             Dicionário {vértice: centralidade_autovetor}
         """
+        n = self.num_vertices
+        sources, targets, _ = self._edge_arrays()
+        
         # Inicialização
-        centrality = {v: 1.0 for v in range(self.num_vertices)}
+        centrality = np.ones(n)
         
         for iteration in range(max_iterations):
-            new_centrality = {v: 0.0 for v in range(self.num_vertices)}
+            # Multiplica matriz de adjacência (transposta) pelo vetor
+            new_centrality = np.bincount(targets, weights=centrality[sources], minlength=n)
             
-            # Multiplica matriz de adjacência pelo vetor
-            for v in range(self.num_vertices):
-                for u in range(self.num_vertices):
-                    if self.graph.hasEdge(u, v):
-                        new_centrality[v] += centrality[u]
-            
-            # Normalização (raiz quadrada implementada manualmente)
-            values = list(new_centrality.values())
-            norm = (sum(x**2 for x in values)) ** 0.5  # Norma euclidiana
+            # Normalização pela norma euclidiana
+            norm = np.sqrt(np.dot(new_centrality, new_centrality))
             
             if norm > 0:
-                for v in new_centrality:
-                    new_centrality[v] /= norm
+                new_centrality /= norm
             
             # Verifica convergência
-            diff = sum(abs(new_centrality[v] - centrality[v]) for v in range(self.num_vertices))
+            diff = np.abs(new_centrality - centrality).sum()
             if diff < tolerance:
                 break
             
             centrality = new_centrality
         
-        return centrality
+        return dict(enumerate(centrality.tolist()))
     
     # =================================================================
     # MÉTRICAS DE REDE - IMPLEMENTADAS DO ZERO
@@ -265,10 +351,15 @@ class GraphAnalyzer:
         
         return actual_edges / max_possible_edges
     
+    @_memoized
     def calculate_average_clustering_coefficient(self) -> float:
         """
         Coeficiente de clustering médio implementado do zero.
         
+        Para cada vértice v com sucessores N(v), conta os pares ordenados
+        (a, b) de N(v) com aresta a -> b, isto é, a linha v de (A·A) ∘ A,
+        via interseção de conjuntos (feita em C) em vez de testar par a par.
+        
         Returns:
             Clustering médio (0 a 1)
         """
@@ -276,28 +367,27 @@ class GraphAnalyzer:
         valid_vertices = 0
         
         for v in range(self.num_vertices):
-            neighbors = list(self.graph.getSuccessors(v))
+            neighbors = self.graph.getSuccessorsView(v)
             degree = len(neighbors)
             
             if degree < 2:
                 continue  # Não pode formar triângulos
             
-            # Conta triângulos
+            # Conta triângulos (pares ordenados de vizinhos ligados)
             triangles = 0
-            for i in range(len(neighbors)):
-                for j in range(i + 1, len(neighbors)):
-                    if self.graph.hasEdge(neighbors[i], neighbors[j]):
-                        triangles += 1
+            for a in neighbors:
+                triangles += len(self.graph.getSuccessorsView(a) & neighbors)
             
             # Clustering local
-            max_triangles = degree * (degree - 1) / 2
-            local_clustering = triangles / max_triangles if max_triangles > 0 else 0
+            max_triangles = degree * (degree - 1)
+            local_clustering = triangles / max_triangles
             
             total_clustering += local_clustering
             valid_vertices += 1
         
         return total_clustering / valid_vertices if valid_vertices > 0 else 0.0
     
+    @_memoized
     def calculate_assortativity(self) -> float:
         """
         Coeficiente de assortatividade implementado do zero.
@@ -311,7 +401,7 @@ class GraphAnalyzer:
         # Coleta dados das arestas
         for u in range(self.num_vertices):
             u_degree = self.graph.getVertexOutDegree(u) + self.graph.getVertexInDegree(u)
-            successors = self.graph.getSuccessors(u)
+            successors = self.graph.getSuccessorsView(u)
             
             for v in successors:
                 v_degree = self.graph.getVertexOutDegree(v) + self.graph.getVertexInDegree(v)
@@ -342,6 +432,7 @@ class GraphAnalyzer:
     # MÉTRICAS DE COMUNIDADE - IMPLEMENTADAS DO ZERO
     # =================================================================
     
+    @_memoized
     def calculate_modularity_simple(self) -> float:
         """
         Modularidade simples baseada na estrutura do grafo.
@@ -368,7 +459,7 @@ class GraphAnalyzer:
             total_degree = 0
             
             for v in community:
-                successors = self.graph.getSuccessors(v)
+                successors = self.graph.getSuccessorsView(v)
                 total_degree += len(successors)
                 
                 for neighbor in successors:
@@ -383,39 +474,41 @@ class GraphAnalyzer:
         
         return modularity
     
+    @_memoized
     def _detect_simple_communities(self) -> Dict[int, Set[int]]:
         """
         Detecção simples de comunidades baseada em componentes conectadas.
-        Implementada do zero usando BFS.
+        Implementada do zero usando BFS. Memoizada: modularidade, bridging
+        ties e as visualizações compartilham o mesmo resultado.
         
         Returns:
             Dicionário {community_id: {vertices}}
         """
-        visited = set()
+        visited = bytearray(self.num_vertices)
         communities = {}
         community_id = 0
         
         for start in range(self.num_vertices):
-            if start not in visited:
+            if not visited[start]:
                 # BFS para encontrar componente conectada
                 community = set()
-                queue = [start]
+                queue = deque([start])
                 
                 while queue:
-                    v = queue.pop(0)
-                    if v not in visited:
-                        visited.add(v)
+                    v = queue.popleft()
+                    if not visited[v]:
+                        visited[v] = 1
                         community.add(v)
                         
                         # Adiciona vizinhos (entrada + saída)
-                        successors = self.graph.getSuccessors(v)
+                        successors = self.graph.getSuccessorsView(v)
                         for neighbor in successors:
-                            if neighbor not in visited:
+                            if not visited[neighbor]:
                                 queue.append(neighbor)
                         
                         # Predecessores (grafo direcionado)
-                        for u in range(self.num_vertices):
-                            if self.graph.hasEdge(u, v) and u not in visited:
+                        for u in self.graph.getPredecessorsView(v):
+                            if not visited[u]:
                                 queue.append(u)
                 
                 if len(community) > 0:
@@ -424,6 +517,7 @@ class GraphAnalyzer:
         
         return communities
     
+    @_memoized
     def calculate_bridging_ties_ratio(self) -> float:
         """
         Proporção de ligações entre grupos.
@@ -447,7 +541,7 @@ class GraphAnalyzer:
         bridging_edges = 0
         
         for u in range(self.num_vertices):
-            successors = self.graph.getSuccessors(u)
+            successors = self.graph.getSuccessorsView(u)
             for v in successors:
                 total_edges += 1
                 
@@ -5,34 +5,103 @@ Trabalho de Teoria dos Grafos - Etapa 3
 Gera gráficos e visualizações das análises de centralidade e métricas de rede.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Set
+import heapq
 import json
 import os
+from operator import itemgetter
+
+# orjson é opcional: quando instalado, serializa os relatórios bem mais rápido
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# O matplotlib só é importado quando um GraphVisualizer é criado: quem
+# usa apenas o carregador e o analisador não paga o custo de importação
+plt = None
+mpatches = None
+LineCollection = None
+FigureCanvasAgg = None
+Figure = None
+to_rgba_array = None
+
+
+def _load_matplotlib() -> None:
+    """Importa o matplotlib (backend Agg) e aplica a configuração, uma única vez."""
+    global plt, mpatches, LineCollection, FigureCanvasAgg, Figure, to_rgba_array
+    if plt is not None:
+        return
+    
+    import matplotlib
+    matplotlib.use('Agg')  # Backend não interativo: só gera arquivos
+    import matplotlib.pyplot as pyplot
+    import matplotlib.patches as patches
+    from matplotlib.collections import LineCollection as line_collection
+    from matplotlib.backends.backend_agg import FigureCanvasAgg as canvas_agg
+    from matplotlib.figure import Figure as figure
+    from matplotlib.colors import to_rgba_array as rgba_array
+    
+    # Configuração para português
+    pyplot.rcParams['font.size'] = 10
+    pyplot.rcParams['figure.figsize'] = (12, 8)
+    pyplot.rcParams['axes.grid'] = True
+    pyplot.rcParams['grid.alpha'] = 0.3
+    
+    plt, mpatches, LineCollection = pyplot, patches, line_collection
+    FigureCanvasAgg, Figure, to_rgba_array = canvas_agg, figure, rgba_array
 
-# Configuração para português
-plt.rcParams['font.size'] = 10
-plt.rcParams['figure.figsize'] = (12, 8)
-plt.rcParams['axes.grid'] = True
-plt.rcParams['grid.alpha'] = 0.3
 
 class GraphVisualizer:
     """
     Classe para visualização das análises de grafos.
     """
     
-    def __init__(self, output_dir: str = "../output"):
+    def __init__(self, output_dir: str = "../output", dpi: int = 120,
+                 high_quality: bool = False, reuse_figures: bool = False,
+                 save_format: str = 'png'):
         """
         Inicializa o visualizador.
         
         Args:
             output_dir: Diretório para salvar visualizações
+            dpi: Resolução dos PNGs gerados
+            high_quality: Se True, usa 300 dpi (saída para impressão)
+            reuse_figures: Se True, gráficos que suportam o modo persistente
+                (plot_network_metrics) mantêm Figure e artistas entre chamadas
+                e apenas atualizam os valores
+            save_format: Formato dos arquivos ('png', 'svg' ou 'pdf'). Formatos
+                vetoriais evitam a codificação PNG; gráficos com muitos
+                artistas (grafos desenhados) continuam em PNG
         """
+        _load_matplotlib()
+        if save_format not in ('png', 'svg', 'pdf'):
+            raise ValueError(f"Formato de saída não suportado: {save_format}")
+        self.save_format = save_format
         self.output_dir = output_dir
+        self.dpi = 300 if high_quality else dpi
         os.makedirs(output_dir, exist_ok=True)
         
+        # Figure única (fora do pyplot), reaproveitada entre os gráficos
+        self._fig: Optional['Figure'] = None
+        self._canvas: Optional['FigureCanvasAgg'] = None
+        
+        # Modo persistente: nome do gráfico -> (Figure, artistas atualizáveis)
+        self.reuse_figures = reuse_figures
+        self._fig_cache: Dict[str, Tuple['Figure', Dict]] = {}
+        
+        # Mapeamento ID -> username normalizado (chaves int e str) e cache
+        # dos nomes truncados usados nos rótulos
+        self._user_mapping_source: Optional[Dict] = None
+        self._user_names: Dict = {}
+        self._display_names: Dict[tuple, str] = {}
+        
+        # Ranking dos usuários por centralidade de grau, calculado uma vez
+        # por conjunto de resultados e fatiado por cada gráfico
+        self._centrality_source: Optional[Dict] = None
+        self._degree_ranking: List[int] = []
+        
         # Paleta de cores profissional
         self.colors = {
             'primary': '#2E86AB',      # Azul principal
@@ -44,6 +113,120 @@ class GraphVisualizer:
             'dark': '#1B1B1E'          # Preto suave
         }
     
+    def __getstate__(self):
+        """Não serializa a Figure (ex.: ao enviar para outro processo)."""
+        state = self.__dict__.copy()
+        state['_fig'] = None
+        state['_canvas'] = None
+        state['_fig_cache'] = {}
+        return state
+    
+    def __setstate__(self, state):
+        """Garante o matplotlib carregado no processo que recebe o objeto."""
+        _load_matplotlib()
+        self.__dict__.update(state)
+    
+    def set_user_mapping(self, user_mapping: Dict[int, str]) -> None:
+        """
+        Normaliza o mapeamento ID -> username uma única vez.
+        
+        Guarda cada ID como int e como str, para que os rótulos funcionem
+        com os dois tipos de chave sem conversões por consulta.
+        
+        Args:
+            user_mapping: Mapeamento ID -> username
+        """
+        names = dict(user_mapping)
+        names.update({str(user_id): name for user_id, name in user_mapping.items()})
+        self._user_mapping_source = user_mapping
+        self._user_names = names
+        self._display_names = {}
+    
+    def _user_names_for(self, user_mapping: Dict[int, str]) -> Dict:
+        """Retorna o mapeamento normalizado, renormalizando se ele mudou."""
+        if user_mapping is not self._user_mapping_source:
+            self.set_user_mapping(user_mapping)
+        return self._user_names
+    
+    def set_centrality_data(self, centrality_data: Dict[str, Dict]) -> None:
+        """
+        Ordena os usuários por centralidade de grau uma única vez.
+        
+        Chamado antes de distribuir os gráficos entre processos, o ranking
+        segue junto com o visualizador e nenhum gráfico reordena os dados.
+        
+        Args:
+            centrality_data: Dados de centralidade por métrica
+        """
+        degree_centrality = centrality_data.get('degree_centrality', {})
+        ids = np.fromiter(map(int, degree_centrality.keys()), dtype=np.int64,
+                          count=len(degree_centrality))
+        values = np.fromiter(degree_centrality.values(), dtype=np.float64,
+                             count=len(degree_centrality))
+        # Ordenação estável: empates na ordem do dicionário, como heapq.nlargest
+        self._centrality_source = centrality_data
+        self._degree_ranking = ids[np.argsort(-values, kind='stable')].tolist()
+    
+    def _top_by_degree(self, centrality_data: Dict[str, Dict], k: int) -> List[int]:
+        """Retorna os k usuários de maior grau, reordenando só se os dados mudaram."""
+        if centrality_data is not self._centrality_source:
+            self.set_centrality_data(centrality_data)
+        return self._degree_ranking[:k]
+    
+    def _display_name(self, user_mapping: Dict[int, str], user_id,
+                      width: int, suffix: str = '...') -> str:
+        """
+        Username truncado em width caracteres (com sufixo), memoizado.
+        
+        Args:
+            user_mapping: Mapeamento ID -> username
+            user_id: ID do usuário (int ou str)
+            width: Número máximo de caracteres antes do sufixo
+            suffix: Sufixo indicando truncamento
+        """
+        names = self._user_names_for(user_mapping)
+        key = (user_id, width, suffix)
+        display = self._display_names.get(key)
+        if display is None:
+            username = names.get(user_id, f"user_{user_id}")
+            display = username[:width] + suffix if len(username) > width else username
+            self._display_names[key] = display
+        return display
+    
+    def _new_figure(self, figsize: Tuple[float, float]) -> 'Figure':
+        """
+        Retorna a Figure reaproveitável, limpa e no tamanho pedido.
+        
+        Evita o estado global do pyplot e a reconstrução do canvas a cada
+        gráfico.
+        """
+        if self._fig is None:
+            self._fig = Figure(figsize=figsize)
+            self._canvas = FigureCanvasAgg(self._fig)
+        else:
+            self._fig.clf()
+            self._fig.set_size_inches(figsize)
+        return self._fig
+    
+    def _save_figure(self, save_path: str, fig: Optional['Figure'] = None,
+                     raster: bool = False) -> None:
+        """
+        Renderiza a Figure atual no diretório de saída.
+        
+        Sem bbox_inches='tight', que renderiza a figura duas vezes; o
+        enquadramento fica a cargo do tight_layout chamado em cada gráfico.
+        A extensão de save_path é trocada por save_format, exceto quando
+        raster=True (gráficos com muitos artistas ficam menores em PNG).
+        PNGs usam compressão zlib nível 1: arquivos um pouco maiores, mas
+        codificação bem mais rápida que o nível padrão (6).
+        """
+        save_format = 'png' if raster else self.save_format
+        save_path = os.path.splitext(save_path)[0] + '.' + save_format
+        canvas = fig.canvas if fig is not None else self._canvas
+        extra = {'pil_kwargs': {'compress_level': 1}} if save_format == 'png' else {}
+        canvas.print_figure(os.path.join(self.output_dir, save_path), format=save_format,
+                            dpi=self.dpi, facecolor='white', **extra)
+    
     def plot_centrality_comparison(self, 
                                  centrality_data: Dict[str, Dict[str, float]], 
                                  user_mapping: Dict[int, str],
@@ -59,11 +242,9 @@ class GraphVisualizer:
             save_path: Caminho para salvar o gráfico
         """
         # Seleciona usuários com maior centralidade de grau
-        degree_centrality = centrality_data.get('degree_centrality', {})
-        top_users = sorted(degree_centrality.items(), 
-                          key=lambda x: x[1], reverse=True)[:top_n]
-        user_ids = [user_id for user_id, _ in top_users]
-        usernames = [user_mapping.get(int(user_id), f"user_{user_id}") for user_id in user_ids]
+        user_ids = self._top_by_degree(centrality_data, top_n)
+        names = self._user_names_for(user_mapping)
+        usernames = [names.get(user_id, f"user_{user_id}") for user_id in user_ids]
         
         # Prepara dados para cada métrica
         metrics = {
@@ -75,7 +256,8 @@ class GraphVisualizer:
         }
         
         # Configuração do gráfico
-        fig, ax = plt.subplots(figsize=(15, 10))
+        fig = self._new_figure(figsize=(15, 10))
+        ax = fig.subplots()
         
         # Largura das barras
         bar_width = 0.15
@@ -85,22 +267,28 @@ class GraphVisualizer:
         colors = [self.colors['primary'], self.colors['secondary'], 
                  self.colors['accent'], self.colors['success'], self.colors['info']]
         
+        # Matriz métrica x usuário, montada uma vez por gather nos vetores
+        # indexados por ID e normalizada por linha
+        ids = np.array([int(user_id) for user_id in user_ids], dtype=np.int64)
+        size = int(ids.max()) + 1 if len(ids) else 0
+        values = np.zeros((len(metrics), len(ids)))
+        for i, metric_data in enumerate(metrics.values()):
+            values[i] = self._centrality_array(metric_data, size)[ids]
+        if len(ids) > 0:
+            max_per_metric = values.max(axis=1, keepdims=True)
+            values = np.divide(values, max_per_metric, out=values, where=max_per_metric > 0)
+        
         # Plota barras para cada métrica
-        for i, (metric_name, metric_data) in enumerate(metrics.items()):
-            values = [metric_data.get(str(user_id), 0) for user_id in user_ids]
-            
-            # Normaliza valores para melhor visualização
-            if values and max(values) > 0:
-                values = [v / max(values) for v in values]
-            
-            bars = ax.bar(r + i * bar_width, values, bar_width, 
+        for i, metric_name in enumerate(metrics):
+            bars = ax.bar(r + i * bar_width, values[i], bar_width, 
                          label=metric_name, color=colors[i % len(colors)], alpha=0.8)
+            for bar in bars:
+                bar.set_rasterized(True)
             
-            # Adiciona valores nas barras (apenas os maiores)
-            for j, (bar, value) in enumerate(zip(bars, values)):
-                if value > 0.1:  # Só mostra valores maiores
-                    ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.01,
-                           f'{value:.2f}', ha='center', va='bottom', fontsize=8)
+            # Valores nas barras (apenas os maiores), um bar_label por métrica
+            ax.bar_label(bars, labels=[f'{value:.2f}' if value > 0.1 else ''
+                                       for value in values[i].tolist()],
+                         padding=3, fontsize=8)
         
         # Configurações do gráfico
         ax.set_xlabel('Usuários', fontweight='bold')
@@ -119,10 +307,8 @@ class GraphVisualizer:
         ax.set_ylim(0, 1.1)
         
         # Layout e salvamento
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.tight_layout()
+        self._save_figure(save_path)
         
         print(f"📊 Gráfico de centralidade salvo: {save_path}")
     
@@ -136,68 +322,135 @@ class GraphVisualizer:
             network_metrics: Métricas da rede
             save_path: Caminho para salvar o gráfico
         """
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+        density = network_metrics.get('density', 0)
+        clustering = network_metrics.get('average_clustering', 0)
+        assortativity = network_metrics.get('assortativity', 0)
+        assortativity_color = self.colors['success'] if assortativity >= 0 else self.colors['accent']
+        vertex_count = network_metrics.get('vertex_count', 0)
+        edge_count = network_metrics.get('edge_count', 0)
+        avg_degree = network_metrics.get('average_degree', 0)
+        values = [vertex_count, edge_count, avg_degree]
+        
+        # Rótulos de cada painel: uma chamada bar_label por eixo
+        bar_labels = ([f'{density:.4f}'], [f'{clustering:.4f}'],
+                      [f'{assortativity:.4f}'], [f'{int(value)}' for value in values])
+        
+        cached = self._fig_cache.get('network_metrics') if self.reuse_figures else None
+        if cached is not None:
+            # Modo persistente: só atualiza alturas, rótulos e limites
+            fig, artists = cached
+            panels = artists['panels']
+            heights = ([density], [clustering], [assortativity], values)
+            for (ax, bars), panel_heights in zip(panels, heights):
+                for bar, height in zip(bars, panel_heights):
+                    bar.set_height(height)
+            panels[2][1][0].set_color(assortativity_color)
+            for label in artists['labels']:
+                label.remove()
+            artists['labels'] = [label for (ax, bars), texts in zip(panels, bar_labels)
+                                 for label in ax.bar_label(bars, labels=texts, padding=3,
+                                                           fontweight='bold')]
+            ax4 = panels[3][0]
+            ax4.relim()
+            ax4.autoscale_view()
+            fig.tight_layout()
+            self._save_figure(save_path, fig)
+            print(f"📊 Gráfico de métricas da rede salvo: {save_path}")
+            return
+        
+        if self.reuse_figures:
+            fig = Figure(figsize=(15, 12))
+            FigureCanvasAgg(fig)
+        else:
+            fig = self._new_figure(figsize=(15, 12))
+        (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
         
         # 1. Densidade da Rede
-        density = network_metrics.get('density', 0)
-        ax1.bar(['Densidade'], [density], color=self.colors['primary'], alpha=0.8)
+        bars1 = ax1.bar(['Densidade'], [density], color=self.colors['primary'], alpha=0.8)
         ax1.set_ylim(0, 1)
         ax1.set_ylabel('Valor')
         ax1.set_title('Densidade da Rede', fontweight='bold')
-        ax1.text(0, density + 0.02, f'{density:.4f}', ha='center', fontweight='bold')
         ax1.grid(True, alpha=0.3, axis='y')
         
         # 2. Coeficiente de Clustering
-        clustering = network_metrics.get('average_clustering', 0)
-        ax2.bar(['Clustering Médio'], [clustering], color=self.colors['secondary'], alpha=0.8)
+        bars2 = ax2.bar(['Clustering Médio'], [clustering], color=self.colors['secondary'], alpha=0.8)
         ax2.set_ylim(0, 1)
         ax2.set_ylabel('Valor')
         ax2.set_title('Coeficiente de Clustering', fontweight='bold')
-        ax2.text(0, clustering + 0.02, f'{clustering:.4f}', ha='center', fontweight='bold')
         ax2.grid(True, alpha=0.3, axis='y')
         
         # 3. Assortatividade
-        assortativity = network_metrics.get('assortativity', 0)
-        color = self.colors['success'] if assortativity >= 0 else self.colors['accent']
-        ax3.bar(['Assortatividade'], [assortativity], color=color, alpha=0.8)
+        bars3 = ax3.bar(['Assortatividade'], [assortativity], color=assortativity_color, alpha=0.8)
         ax3.set_ylim(-1, 1)
         ax3.set_ylabel('Valor')
         ax3.set_title('Assortatividade da Rede', fontweight='bold')
         ax3.axhline(y=0, color='black', linestyle='--', alpha=0.5)
-        ax3.text(0, assortativity + (0.02 if assortativity >= 0 else -0.05), 
-                f'{assortativity:.4f}', ha='center', fontweight='bold')
         ax3.grid(True, alpha=0.3, axis='y')
         
         # 4. Componentes e Métricas Gerais
-        vertex_count = network_metrics.get('vertex_count', 0)
-        edge_count = network_metrics.get('edge_count', 0)
-        avg_degree = network_metrics.get('average_degree', 0)
-        
         metrics = ['Vértices', 'Arestas', 'Grau Médio']
-        values = [vertex_count, edge_count, avg_degree]
         colors_list = [self.colors['info'], self.colors['accent'], self.colors['primary']]
         
-        bars = ax4.bar(metrics, values, color=colors_list, alpha=0.8)
+        bars4 = ax4.bar(metrics, values, color=colors_list, alpha=0.8)
         ax4.set_ylabel('Quantidade')
         ax4.set_title('Métricas Estruturais', fontweight='bold')
+        ax4.grid(True, alpha=0.3, axis='y')
         
         # Adiciona valores nas barras
-        for bar, value in zip(bars, values):
-            ax4.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(values) * 0.01,
-                    f'{int(value)}', ha='center', va='bottom', fontweight='bold')
-        
-        ax4.grid(True, alpha=0.3, axis='y')
+        panels = [(ax1, bars1), (ax2, bars2), (ax3, bars3), (ax4, bars4)]
+        labels = [label for (ax, bars), texts in zip(panels, bar_labels)
+                  for label in ax.bar_label(bars, labels=texts, padding=3, fontweight='bold')]
         
         # Layout e salvamento
-        plt.suptitle('Análise Estrutural da Rede de Colaboração', 
+        fig.suptitle('Análise Estrutural da Rede de Colaboração', 
                     fontweight='bold', fontsize=16, y=0.98)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.tight_layout()
+        self._save_figure(save_path, fig)
+        
+        if self.reuse_figures:
+            self._fig_cache['network_metrics'] = (fig, {'panels': panels, 'labels': labels})
         
         print(f"📊 Gráfico de métricas da rede salvo: {save_path}")
     
+    @staticmethod
+    def _centrality_array(values: Dict, size: int) -> np.ndarray:
+        """
+        Converte {user_id: valor} em vetor indexado pelo ID do usuário.
+        
+        Aceita chaves int ou str (ex.: dados relidos de JSON); IDs ausentes
+        ficam com 0 e IDs fora do tamanho pedido são ignorados.
+        
+        Args:
+            values: Centralidade por usuário
+            size: Tamanho do vetor (maior ID consultado + 1)
+            
+        Returns:
+            np.ndarray float64 de tamanho size
+        """
+        array = np.zeros(size)
+        if values:
+            ids = np.fromiter(map(int, values.keys()), dtype=np.int64, count=len(values))
+            data = np.fromiter(values.values(), dtype=np.float64, count=len(values))
+            inside = ids < size
+            array[ids[inside]] = data[inside]
+        return array
+    
+    @staticmethod
+    def _extract_edges(graph) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extrai as arestas do grafo como vetores (origens, destinos) a partir
+        da CSR, em uma única chamada.
+        
+        Args:
+            graph: Grafo com acesso à CSR (getCSR)
+            
+        Returns:
+            (sources, targets)
+        """
+        indptr, targets = graph.getCSR()
+        sources = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        return sources, targets
+    
     def plot_degree_distribution(self, 
                                 graph,
                                 user_mapping: Dict[int, str],
@@ -210,28 +463,31 @@ class GraphVisualizer:
             user_mapping: Mapeamento ID -> username  
             save_path: Caminho para salvar o gráfico
         """
-        # Calcula graus
-        degrees = []
-        for vertex_id in range(graph.getVertexCount()):
-            in_degree = graph.getVertexInDegree(vertex_id)
-            out_degree = graph.getVertexOutDegree(vertex_id)
-            total_degree = in_degree + out_degree
-            degrees.append((vertex_id, in_degree, out_degree, total_degree))
-        
-        # Separa dados
-        in_degrees = [d[1] for d in degrees]
-        out_degrees = [d[2] for d in degrees]
-        total_degrees = [d[3] for d in degrees]
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
-        
-        # 1. Histograma da distribuição
-        ax1.hist(total_degrees, bins=20, alpha=0.7, color=self.colors['primary'], 
-                edgecolor='black', label='Grau Total')
-        ax1.hist(in_degrees, bins=20, alpha=0.5, color=self.colors['secondary'], 
-                edgecolor='black', label='Grau de Entrada')
-        ax1.hist(out_degrees, bins=20, alpha=0.5, color=self.colors['accent'], 
-                edgecolor='black', label='Grau de Saída')
+        # Calcula graus com duas contagens vetorizadas sobre as arestas
+        num_vertices = graph.getVertexCount()
+        sources, targets = self._extract_edges(graph)
+        in_degrees = np.bincount(targets, minlength=num_vertices)
+        out_degrees = np.bincount(sources, minlength=num_vertices)
+        total_degrees = in_degrees + out_degrees
+        
+        fig = self._new_figure(figsize=(16, 7))
+        ax1, ax2 = fig.subplots(1, 2)
+        
+        # 1. Histograma da distribuição: contagem vetorizada com np.histogram
+        # e um único artista (stairs) por série, em vez de uma barra por bin.
+        # As três séries compartilham as mesmas bordas, calculadas uma vez.
+        if num_vertices:
+            edges = np.linspace(min(in_degrees.min(), out_degrees.min()),
+                                total_degrees.max(), 21)
+        else:
+            edges = np.histogram_bin_edges(total_degrees, bins=20)
+        for degrees, alpha, color, label in (
+                (total_degrees, 0.7, self.colors['primary'], 'Grau Total'),
+                (in_degrees, 0.5, self.colors['secondary'], 'Grau de Entrada'),
+                (out_degrees, 0.5, self.colors['accent'], 'Grau de Saída')):
+            counts, _ = np.histogram(degrees, bins=edges)
+            ax1.stairs(counts, edges, fill=True, alpha=alpha, color=color,
+                       edgecolor='black', label=label)
         
         ax1.set_xlabel('Grau')
         ax1.set_ylabel('Frequência')
@@ -239,15 +495,24 @@ class GraphVisualizer:
         ax1.legend()
         ax1.grid(True, alpha=0.3)
         
-        # 2. Top usuários por grau
-        top_users = sorted(degrees, key=lambda x: x[3], reverse=True)[:15]
-        usernames = [user_mapping.get(user[0], f"user_{user[0]}")[:15] + 
-                    ('...' if len(user_mapping.get(user[0], '')) > 15 else '') 
-                    for user in top_users]
-        user_degrees = [user[3] for user in top_users]
+        # 2. Top usuários por grau (ordenação estável: empates por ID).
+        # np.partition acha o 15º maior grau em O(V); só os candidatos
+        # com grau >= esse limiar são ordenados.
+        k = min(15, num_vertices)
+        if k:
+            threshold = np.partition(total_degrees, num_vertices - k)[num_vertices - k]
+            candidates = np.flatnonzero(total_degrees >= threshold)
+            order = np.argsort(-total_degrees[candidates], kind='stable')[:k]
+            top_users = candidates[order].tolist()
+        else:
+            top_users = []
+        usernames = [self._display_name(user_mapping, user_id, 15) for user_id in top_users]
+        user_degrees = total_degrees[top_users].tolist()
         
         bars = ax2.barh(range(len(usernames)), user_degrees, 
                        color=self.colors['primary'], alpha=0.8)
+        for bar in bars:
+            bar.set_rasterized(True)
         ax2.set_yticks(range(len(usernames)))
         ax2.set_yticklabels(usernames)
         ax2.set_xlabel('Grau Total')
@@ -255,16 +520,12 @@ class GraphVisualizer:
         ax2.grid(True, alpha=0.3, axis='x')
         
         # Adiciona valores nas barras
-        for i, (bar, degree) in enumerate(zip(bars, user_degrees)):
-            ax2.text(bar.get_width() + max(user_degrees) * 0.01, bar.get_y() + bar.get_height()/2,
-                    str(degree), va='center', fontweight='bold')
+        ax2.bar_label(bars, padding=3, fontweight='bold')
         
         ax2.invert_yaxis()  # Inverte para mostrar maior no topo
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.tight_layout()
+        self._save_figure(save_path)
         
         print(f"📊 Gráfico de distribuição de graus salvo: {save_path}")
     
@@ -278,7 +539,8 @@ class GraphVisualizer:
             community_metrics: Métricas de comunidades
             save_path: Caminho para salvar o gráfico
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
+        fig = self._new_figure(figsize=(15, 7))
+        ax1, ax2 = fig.subplots(1, 2)
         
         # 1. Modularidade
         modularity = community_metrics.get('modularity', 0)
@@ -294,9 +556,7 @@ class GraphVisualizer:
         ax1.set_ylim(0, max(1, max(values) * 1.1))
         
         # Adiciona valores nas barras
-        for bar, value in zip(bars, values):
-            ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(values) * 0.02,
-                    f'{value:.4f}', ha='center', va='bottom', fontweight='bold')
+        ax1.bar_label(bars, fmt='%.4f', padding=3, fontweight='bold')
         
         ax1.grid(True, alpha=0.3, axis='y')
         
@@ -332,10 +592,8 @@ class GraphVisualizer:
         ax2.set_title('Interpretação da Análise Comunitária', 
                      fontweight='bold', pad=20)
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.tight_layout()
+        self._save_figure(save_path)
         
         print(f"📊 Gráfico de análise comunitária salvo: {save_path}")
     
@@ -355,57 +613,60 @@ class GraphVisualizer:
         """
         # Seleciona top 30 usuários para visualização (grafo completo seria muito poluído)
         degree_centrality = centrality_data.get('degree_centrality', {})
-        top_users = sorted(degree_centrality.items(), key=lambda x: x[1], reverse=True)[:30]
-        top_user_ids = [int(user_id) for user_id, _ in top_users]
+        top_user_ids = self._top_by_degree(centrality_data, 30)
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 9))
+        fig = self._new_figure(figsize=(18, 9))
+        ax1, ax2 = fig.subplots(1, 2)
         
         # 1. Grafo com layout circular
-        positions = {}
-        angle_step = 2 * 3.14159 / len(top_user_ids)
-        
-        for i, user_id in enumerate(top_user_ids):
-            angle = i * angle_step
-            radius = 3
-            positions[user_id] = (radius * (angle / 6.28), radius * (angle / 6.28 + 1))
+        radius = 3
+        angles = np.arange(len(top_user_ids)) * (2 * np.pi / len(top_user_ids))
+        xs = radius * np.cos(angles)
+        ys = radius * np.sin(angles)
+        positions = dict(zip(top_user_ids, zip(xs.tolist(), ys.tolist())))
         
         # Desenha nós
+        ids = np.array(top_user_ids, dtype=np.int64)
+        size = int(ids.max()) + 1
+        
+        # Tamanho proporcional à centralidade
+        sizes = 100 + self._centrality_array(degree_centrality, size)[ids] * 2000
+        
+        # Cor baseada no PageRank
+        pagerank = self._centrality_array(centrality_data.get('pagerank_centrality', {}), size)[ids]
+        color_intensities = np.minimum(1.0, pagerank * 10)  # Normaliza
+        
+        # Um único scatter para todos os nós (uma PathCollection, um colormap)
+        ax1.scatter(xs, ys, s=sizes, c=color_intensities, cmap='viridis', vmin=0, vmax=1,
+                   alpha=0.7, edgecolors='black', linewidth=1)
+        
+        # Labels dos usuários
         for user_id in top_user_ids:
-            x, y = positions[user_id]
-            centrality = degree_centrality.get(str(user_id), 0)
-            
-            # Tamanho proporcional à centralidade
-            size = 100 + centrality * 2000
-            
-            # Cor baseada no PageRank
-            pagerank = centrality_data.get('pagerank_centrality', {}).get(str(user_id), 0)
-            color_intensity = min(1.0, pagerank * 10)  # Normaliza
-            
-            ax1.scatter(x, y, s=size, c=color_intensity, cmap='viridis', 
-                       alpha=0.7, edgecolors='black', linewidth=1)
-            
-            # Label do usuário
-            username = user_mapping.get(user_id, f"user_{user_id}")
-            short_name = username[:8] + '...' if len(username) > 8 else username
-            ax1.annotate(short_name, (x, y), xytext=(5, 5), textcoords='offset points',
-                        fontsize=8, ha='left')
+            ax1.annotate(self._display_name(user_mapping, user_id, 8), positions[user_id],
+                        xytext=(5, 5), textcoords='offset points', fontsize=8, ha='left')
         
-        # Desenha arestas direcionadas
+        # Desenha arestas direcionadas: acumula segmentos e desenha todos de
+        # uma vez (LineCollection para as linhas, um quiver para as pontas)
+        segments = []
+        line_widths = []
         for source_id in top_user_ids:
-            successors = graph.getSuccessors(source_id)
+            successors = graph.getSuccessorsView(source_id)
             for target_id in successors:
-                if target_id in top_user_ids:
-                    x1, y1 = positions[source_id]
-                    x2, y2 = positions[target_id]
-                    
-                    # Peso da aresta
-                    weight = graph.getEdgeWeight(source_id, target_id) if graph.hasEdge(source_id, target_id) else 1
-                    line_width = max(0.5, weight / 3)  # Espessura baseada no peso
+                if target_id in positions:
+                    segments.append((positions[source_id], positions[target_id]))
                     
-                    # Seta direcionada
-                    ax1.annotate('', xy=(x2, y2), xytext=(x1, y1),
-                               arrowprops=dict(arrowstyle='->', lw=line_width, 
-                                             color=self.colors['primary'], alpha=0.6))
+                    # Peso da aresta (a aresta existe: veio dos sucessores)
+                    weight = graph.getEdgeWeight(source_id, target_id)
+                    line_widths.append(max(0.5, weight / 3))  # Espessura baseada no peso
+        
+        if segments:
+            ax1.add_collection(LineCollection(segments, linewidths=line_widths,
+                                              colors=self.colors['primary'], alpha=0.6))
+            starts = np.array([start for start, _ in segments])
+            deltas = np.array([end for _, end in segments]) - starts
+            ax1.quiver(starts[:, 0], starts[:, 1], deltas[:, 0], deltas[:, 1],
+                       angles='xy', scale_units='xy', scale=1, width=0.003,
+                       color=self.colors['primary'], alpha=0.6)
         
         ax1.set_title('Rede de Colaboração Direcionada\n(Top 30 Usuários)', 
                      fontweight='bold', fontsize=14)
@@ -418,15 +679,13 @@ class GraphVisualizer:
         out_degrees = []
         usernames = []
         
-        for user_id, _ in top_users[:15]:  # Top 15 para melhor visualização
-            user_id_int = int(user_id)
-            in_deg = graph.getVertexInDegree(user_id_int)
-            out_deg = graph.getVertexOutDegree(user_id_int)
+        for user_id in top_user_ids[:15]:  # Top 15 para melhor visualização
+            in_deg = graph.getVertexInDegree(user_id)
+            out_deg = graph.getVertexOutDegree(user_id)
             
             in_degrees.append(in_deg)
             out_degrees.append(out_deg)
-            username = user_mapping.get(user_id_int, f"user_{user_id}")
-            usernames.append(username[:12] + '...' if len(username) > 12 else username)
+            usernames.append(self._display_name(user_mapping, user_id, 12))
         
         x = range(len(usernames))
         width = 0.35
@@ -444,18 +703,13 @@ class GraphVisualizer:
         ax2.legend()
         ax2.grid(True, alpha=0.3, axis='y')
         
-        # Adiciona valores nas barras
-        for bars in [bars1, bars2]:
-            for bar in bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax2.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                            f'{int(height)}', ha='center', va='bottom', fontsize=9)
+        # Adiciona valores nas barras (graus nulos ficam sem rótulo)
+        for bars, degrees in ((bars1, in_degrees), (bars2, out_degrees)):
+            ax2.bar_label(bars, labels=[str(degree) if degree > 0 else '' for degree in degrees],
+                          padding=2, fontsize=9)
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.tight_layout()
+        self._save_figure(save_path, raster=True)
         
         print(f"📊 Gráfico do grafo direcionado salvo: {save_path}")
     
@@ -476,28 +730,30 @@ class GraphVisualizer:
         # Detecta comunidades
         communities = analyzer._detect_simple_communities()
         
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+        fig = self._new_figure(figsize=(16, 12))
+        (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
         
         # 1. Distribuição de tamanhos das comunidades
-        community_sizes = [len(vertices) for vertices in communities.values()]
+        community_sizes = np.fromiter((len(vertices) for vertices in communities.values()),
+                                      dtype=np.int64, count=len(communities))
         
-        ax1.hist(community_sizes, bins=20, color=self.colors['primary'], alpha=0.7, edgecolor='black')
+        size_counts, size_edges = np.histogram(community_sizes, bins=20)
+        ax1.stairs(size_counts, size_edges, fill=True, color=self.colors['primary'],
+                   alpha=0.7, edgecolor='black')
         ax1.set_xlabel('Tamanho da Comunidade')
         ax1.set_ylabel('Frequência')
         ax1.set_title('Distribuição de Tamanhos das Comunidades', fontweight='bold')
         ax1.grid(True, alpha=0.3)
         
         # Estatísticas
-        if community_sizes:
-            mean_size = sum(community_sizes) / len(community_sizes)
-            max_size = max(community_sizes)
+        if community_sizes.size:
+            mean_size = community_sizes.mean()
             ax1.axvline(mean_size, color='red', linestyle='--', 
                        label=f'Média: {mean_size:.1f}')
             ax1.legend()
         
         # 2. Top 10 maiores comunidades
-        largest_communities = sorted(communities.items(), 
-                                   key=lambda x: len(x[1]), reverse=True)[:10]
+        largest_communities = heapq.nlargest(10, communities.items(), key=lambda x: len(x[1]))
         
         comm_labels = [f'Com. {comm_id}' for comm_id, _ in largest_communities]
         comm_sizes = [len(vertices) for _, vertices in largest_communities]
@@ -510,26 +766,24 @@ class GraphVisualizer:
         ax2.grid(True, alpha=0.3, axis='y')
         
         # Adiciona valores
-        for bar, size in zip(bars, comm_sizes):
-            ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                    str(size), ha='center', va='bottom', fontweight='bold')
+        ax2.bar_label(bars, padding=3, fontweight='bold')
         
         # 3. Densidade interna das comunidades
         densities = []
         comm_names = []
         
+        # Arestas internas de todas as comunidades em uma única contagem:
+        # arestas cujas duas pontas estão na mesma comunidade
+        community_of = self._community_vector(graph, communities)
+        sources, targets = self._extract_edges(graph)
+        source_comm = community_of[sources]
+        internal = source_comm[(source_comm != -1) & (source_comm == community_of[targets])]
+        internal_counts = np.bincount(internal, minlength=max(communities, default=-1) + 1)
+        
         for comm_id, vertices in largest_communities[:8]:  # Top 8 para visualização
-            vertices_list = list(vertices)
-            if len(vertices_list) > 1:
-                # Conta arestas internas
-                internal_edges = 0
-                possible_edges = len(vertices_list) * (len(vertices_list) - 1)
-                
-                for v in vertices_list:
-                    successors = graph.getSuccessors(v)
-                    for neighbor in successors:
-                        if neighbor in vertices:
-                            internal_edges += 1
+            if len(vertices) > 1:
+                internal_edges = int(internal_counts[comm_id])
+                possible_edges = len(vertices) * (len(vertices) - 1)
                 
                 density = internal_edges / possible_edges if possible_edges > 0 else 0
                 densities.append(density)
@@ -544,20 +798,16 @@ class GraphVisualizer:
             ax3.set_ylim(0, max(1, max(densities) * 1.1))
             
             # Adiciona valores
-            for bar, density in zip(bars3, densities):
-                ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.01,
-                        f'{density:.3f}', ha='center', va='bottom', fontweight='bold')
+            ax3.bar_label(bars3, fmt='%.3f', padding=3, fontweight='bold')
         
         # 4. Bridging ties - usuários que conectam comunidades
         bridging_users = self._find_bridging_users(graph, communities, user_mapping)
         
         if bridging_users:
             # Top 10 bridging users
-            top_bridging = sorted(bridging_users.items(), 
-                                key=lambda x: x[1], reverse=True)[:10]
+            top_bridging = heapq.nlargest(10, bridging_users.items(), key=itemgetter(1))
             
-            bridge_names = [user_mapping.get(user_id, f"user_{user_id}")[:10] + 
-                           ('...' if len(user_mapping.get(user_id, '')) > 10 else '')
+            bridge_names = [self._display_name(user_mapping, user_id, 10)
                            for user_id, _ in top_bridging]
             bridge_counts = [count for _, count in top_bridging]
             
@@ -571,23 +821,36 @@ class GraphVisualizer:
             ax4.invert_yaxis()
             
             # Adiciona valores
-            for i, (bar, count) in enumerate(zip(bars4, bridge_counts)):
-                ax4.text(bar.get_width() + max(bridge_counts) * 0.01, bar.get_y() + bar.get_height()/2,
-                        str(count), va='center', fontweight='bold')
+            ax4.bar_label(bars4, padding=3, fontweight='bold')
         else:
             ax4.text(0.5, 0.5, 'Nenhum usuário ponte\nidentificado', 
                     ha='center', va='center', transform=ax4.transAxes,
                     fontsize=12, style='italic')
             ax4.set_title('Análise de Bridging Ties', fontweight='bold')
         
-        plt.suptitle('Análise Detalhada de Comunidades', fontweight='bold', fontsize=16)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.suptitle('Análise Detalhada de Comunidades', fontweight='bold', fontsize=16)
+        fig.tight_layout()
+        self._save_figure(save_path)
         
         print(f"📊 Gráfico de detecção de comunidades salvo: {save_path}")
     
+    @staticmethod
+    def _community_vector(graph, communities: Dict[int, set]) -> np.ndarray:
+        """
+        Vetor usuário -> comunidade (-1 para usuários sem comunidade).
+        
+        Args:
+            graph: Grafo para análise
+            communities: Comunidades detectadas
+            
+        Returns:
+            np.ndarray de tamanho V com o ID da comunidade de cada vértice
+        """
+        community_of = np.full(graph.getVertexCount(), -1, dtype=np.int64)
+        for comm_id, users in communities.items():
+            community_of[list(users)] = comm_id
+        return community_of
+    
     def _find_bridging_users(self, graph, communities: Dict[int, set], 
                            user_mapping: Dict[int, str]) -> Dict[int, int]:
         """
@@ -601,37 +864,19 @@ class GraphVisualizer:
         Returns:
             Dicionário {user_id: num_bridging_connections}
         """
-        # Mapeamento usuário -> comunidade
-        user_to_community = {}
-        for comm_id, users in communities.items():
-            for user in users:
-                user_to_community[user] = comm_id
+        community_of = self._community_vector(graph, communities)
         
-        bridging_counts = {}
+        # Uma aresta é ponte quando liga duas comunidades distintas; ela conta
+        # tanto para a origem (saída) quanto para o destino (entrada)
+        sources, targets = self._extract_edges(graph)
+        source_comm = community_of[sources]
+        target_comm = community_of[targets]
+        is_bridge = (source_comm != -1) & (target_comm != -1) & (source_comm != target_comm)
+        counts = (np.bincount(sources[is_bridge], minlength=len(community_of)) +
+                  np.bincount(targets[is_bridge], minlength=len(community_of)))
         
-        for user_id in range(graph.getVertexCount()):
-            if user_id not in user_to_community:
-                continue
-                
-            user_community = user_to_community[user_id]
-            bridging_connections = 0
-            
-            # Verifica sucessores (saídas)
-            successors = graph.getSuccessors(user_id)
-            for neighbor in successors:
-                neighbor_community = user_to_community.get(neighbor, -1)
-                if neighbor_community != user_community and neighbor_community != -1:
-                    bridging_connections += 1
-            
-            # Verifica predecessores (entradas)
-            for other_user in range(graph.getVertexCount()):
-                if graph.hasEdge(other_user, user_id):
-                    other_community = user_to_community.get(other_user, -1)
-                    if other_community != user_community and other_community != -1:
-                        bridging_connections += 1
-            
-            if bridging_connections > 0:
-                bridging_counts[user_id] = bridging_connections
+        bridging_users = np.flatnonzero(counts)
+        bridging_counts = dict(zip(bridging_users.tolist(), counts[bridging_users].tolist()))
         
         return bridging_counts
     
@@ -649,34 +894,38 @@ class GraphVisualizer:
             centrality_data: Dados de centralidade
             save_path: Caminho para salvar
         """
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+        fig = self._new_figure(figsize=(16, 12))
+        (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
         
         # 1. Análise de Influência vs Receptividade
         influence_scores = []  # Out-degree (quantos eles influenciam)
         receptivity_scores = []  # In-degree (quantos os influenciam)
         user_names = []
         
-        degree_centrality = centrality_data.get('degree_centrality', {})
-        top_users = sorted(degree_centrality.items(), key=lambda x: x[1], reverse=True)[:20]
+        top_users = self._top_by_degree(centrality_data, 20)
         
-        for user_id, _ in top_users:
-            user_id_int = int(user_id)
+        for user_id_int in top_users:
             out_degree = graph.getVertexOutDegree(user_id_int)
             in_degree = graph.getVertexInDegree(user_id_int)
             
             influence_scores.append(out_degree)
             receptivity_scores.append(in_degree)
-            username = user_mapping.get(user_id_int, f"user_{user_id}")
-            user_names.append(username[:10] + '...' if len(username) > 10 else username)
+            user_names.append(self._display_name(user_mapping, user_id_int, 10))
         
         # Scatter plot Influência vs Receptividade
         ax1.scatter(influence_scores, receptivity_scores, s=100, 
                    color=self.colors['primary'], alpha=0.7, edgecolors='black')
         
+        # Máximos calculados uma vez: cortes dos labels e linha diagonal
+        max_influence = max(influence_scores, default=1)
+        max_receptivity = max(receptivity_scores, default=1)
+        
         # Adiciona labels dos usuários mais extremos
+        influence_cut = max_influence * 0.7
+        receptivity_cut = max_receptivity * 0.7
         for i, name in enumerate(user_names):
-            if (influence_scores[i] > max(influence_scores) * 0.7 or 
-                receptivity_scores[i] > max(receptivity_scores) * 0.7):
+            if (influence_scores[i] > influence_cut or 
+                receptivity_scores[i] > receptivity_cut):
                 ax1.annotate(name, (influence_scores[i], receptivity_scores[i]),
                            xytext=(5, 5), textcoords='offset points', fontsize=9)
         
@@ -686,73 +935,60 @@ class GraphVisualizer:
         ax1.grid(True, alpha=0.3)
         
         # Linha diagonal para comparação
-        max_val = max(max(influence_scores) if influence_scores else 1, 
-                     max(receptivity_scores) if receptivity_scores else 1)
+        max_val = max(max_influence, max_receptivity)
         ax1.plot([0, max_val], [0, max_val], 'r--', alpha=0.5, label='Influência = Receptividade')
         ax1.legend()
         
-        # 2. Razão Influência/Receptividade
-        ratios = []
-        ratio_names = []
+        # 2. Razão Influência/Receptividade: filtros como máscaras sobre os vetores
+        influence = np.asarray(influence_scores, dtype=float)
+        receptivity = np.asarray(receptivity_scores, dtype=float)
+        has_receptivity = receptivity > 0  # Evita divisão por zero
+        ratios = np.divide(influence, receptivity, out=np.zeros_like(influence),
+                           where=has_receptivity)
+        keep = has_receptivity & (ratios > 0.1) & (ratios < 10)  # Remove valores extremos
         
-        for i, name in enumerate(user_names):
-            if receptivity_scores[i] > 0:  # Evita divisão por zero
-                ratio = influence_scores[i] / receptivity_scores[i]
-                if ratio > 0.1 and ratio < 10:  # Remove valores extremos
-                    ratios.append(ratio)
-                    ratio_names.append(name)
-        
-        if ratios:
-            # Separa em influenciadores vs receptores
-            influencers = [(name, ratio) for name, ratio in zip(ratio_names, ratios) if ratio > 1.2]
-            receivers = [(name, ratio) for name, ratio in zip(ratio_names, ratios) if ratio < 0.8]
+        # Influenciadores (razão > 1.2), do maior para o menor
+        influencers = np.flatnonzero(keep & (ratios > 1.2))
+        
+        if len(influencers):
+            influencers = influencers[np.argsort(-ratios[influencers], kind='stable')][:8]  # Top 8
             
-            if influencers:
-                influencers.sort(key=lambda x: x[1], reverse=True)
-                influencers = influencers[:8]  # Top 8
-                
-                names = [name for name, _ in influencers]
-                vals = [ratio for _, ratio in influencers]
-                
-                bars = ax2.barh(range(len(names)), vals, color=self.colors['accent'], alpha=0.8)
-                ax2.set_yticks(range(len(names)))
-                ax2.set_yticklabels(names)
-                ax2.set_xlabel('Razão Influência/Receptividade')
-                ax2.set_title('Top Influenciadores\n(Razão > 1.2)', fontweight='bold')
-                ax2.invert_yaxis()
-                ax2.axvline(1, color='red', linestyle='--', alpha=0.7)
-                ax2.grid(True, alpha=0.3, axis='x')
-                
-                # Adiciona valores
-                for bar, val in zip(bars, vals):
-                    ax2.text(bar.get_width() + 0.05, bar.get_y() + bar.get_height()/2,
-                            f'{val:.2f}', va='center', fontweight='bold')
+            names = [user_names[i] for i in influencers]
+            vals = ratios[influencers]
+            
+            bars = ax2.barh(range(len(names)), vals, color=self.colors['accent'], alpha=0.8)
+            ax2.set_yticks(range(len(names)))
+            ax2.set_yticklabels(names)
+            ax2.set_xlabel('Razão Influência/Receptividade')
+            ax2.set_title('Top Influenciadores\n(Razão > 1.2)', fontweight='bold')
+            ax2.invert_yaxis()
+            ax2.axvline(1, color='red', linestyle='--', alpha=0.7)
+            ax2.grid(True, alpha=0.3, axis='x')
+            
+            # Adiciona valores
+            ax2.bar_label(bars, fmt='%.2f', padding=3, fontweight='bold')
         
         # 3. PageRank vs Betweenness (mostra diferentes tipos de importância)
-        pagerank_values = []
-        betweenness_values = []
-        pr_bt_names = []
-        
-        pagerank_data = centrality_data.get('pagerank_centrality', {})
-        betweenness_data = centrality_data.get('betweenness_centrality', {})
+        pr_bt_ids = np.array(top_users[:15], dtype=np.int64)
+        size = int(pr_bt_ids.max()) + 1 if len(pr_bt_ids) else 0
+        pagerank_data = self._centrality_array(centrality_data.get('pagerank_centrality', {}), size)
+        betweenness_data = self._centrality_array(centrality_data.get('betweenness_centrality', {}), size)
         
-        for user_id, _ in top_users[:15]:
-            pagerank_val = pagerank_data.get(str(user_id), 0)
-            betweenness_val = betweenness_data.get(str(user_id), 0)
-            
-            pagerank_values.append(pagerank_val * 1000)  # Escala para visualização
-            betweenness_values.append(betweenness_val * 1000)  # Escala para visualização
-            
-            username = user_mapping.get(int(user_id), f"user_{user_id}")
-            pr_bt_names.append(username[:8] + '...' if len(username) > 8 else username)
+        # Escala para visualização
+        pagerank_values = (pagerank_data[pr_bt_ids] * 1000).tolist()
+        betweenness_values = (betweenness_data[pr_bt_ids] * 1000).tolist()
+        pr_bt_names = [self._display_name(user_mapping, user_id, 8)
+                       for user_id in pr_bt_ids.tolist()]
         
         ax3.scatter(pagerank_values, betweenness_values, s=100,
                    color=self.colors['secondary'], alpha=0.7, edgecolors='black')
         
         # Labels para pontos interessantes
+        pagerank_cut = max(pagerank_values, default=0) * 0.6
+        betweenness_cut = max(betweenness_values, default=0) * 0.6
         for i, name in enumerate(pr_bt_names):
-            if (pagerank_values[i] > max(pagerank_values) * 0.6 or 
-                betweenness_values[i] > max(betweenness_values) * 0.6):
+            if (pagerank_values[i] > pagerank_cut or 
+                betweenness_values[i] > betweenness_cut):
                 ax3.annotate(name, (pagerank_values[i], betweenness_values[i]),
                            xytext=(5, 5), textcoords='offset points', fontsize=9)
         
@@ -762,14 +998,16 @@ class GraphVisualizer:
         ax3.grid(True, alpha=0.3)
         
         # 4. Reciprocidade de Conexões
-        reciprocal_edges = 0
         total_directed_edges = graph.getEdgeCount()
         
-        for u in range(graph.getVertexCount()):
-            successors = graph.getSuccessors(u)
-            for v in successors:
-                if graph.hasEdge(v, u):  # Conexão recíproca
-                    reciprocal_edges += 1
+        # Cada aresta (u, v) vira a chave u·V + v; a aresta é recíproca quando
+        # a chave de (v, u) também existe, testado para todas de uma vez
+        sources, targets = self._extract_edges(graph)
+        targets = targets.astype(np.int64, copy=False)
+        vertex_count = graph.getVertexCount()
+        edge_keys = sources * vertex_count + targets
+        reverse_keys = targets * vertex_count + sources
+        reciprocal_edges = int(np.isin(reverse_keys, edge_keys).sum())
         
         reciprocal_edges = reciprocal_edges // 2  # Cada par é contado duas vezes
         reciprocity_rate = reciprocal_edges / total_directed_edges if total_directed_edges > 0 else 0
@@ -783,11 +1021,9 @@ class GraphVisualizer:
         ax4.set_title(f'Reciprocidade da Rede\n({reciprocity_rate:.1%} das conexões são recíprocas)', 
                      fontweight='bold')
         
-        plt.suptitle('Análise de Fluxo Direcionado da Rede', fontweight='bold', fontsize=16)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.suptitle('Análise de Fluxo Direcionado da Rede', fontweight='bold', fontsize=16)
+        fig.tight_layout()
+        self._save_figure(save_path)
         
         print(f"📊 Gráfico de análise de fluxo direcionado salvo: {save_path}")
     
@@ -809,15 +1045,20 @@ class GraphVisualizer:
             save_path: Caminho para salvar
         """
         # Seleciona usuários mais importantes para visualização (grafo completo seria ilegível)
-        degree_centrality = centrality_data.get('degree_centrality', {})
-        top_users = sorted(degree_centrality.items(), key=lambda x: x[1], reverse=True)[:50]
-        selected_users = [int(user_id) for user_id, _ in top_users]
+        selected_users = self._top_by_degree(centrality_data, 50)
         
         print(f"   🎨 Desenhando grafo com {len(selected_users)} usuários principais...")
         
         # Gera posições usando algoritmo de força simples (implementado manualmente)
         positions = self._calculate_spring_layout(graph, selected_users)
         
+        # Sucessores de cada usuário restritos aos selecionados, com o peso
+        # da aresta, montados uma única vez e compartilhados pelos quatro desenhos
+        selected_set = frozenset(selected_users)
+        adjacency = {user: [(succ, graph.getEdgeWeight(user, succ))
+                            for succ in graph.getSuccessorsView(user) if succ in selected_set]
+                     for user in selected_users}
+        
         # Mapeia usuários para comunidades
         user_to_community = {}
         community_colors = {}
@@ -827,36 +1068,41 @@ class GraphVisualizer:
         for comm_id, users in communities.items():
             community_colors[comm_id] = color_palette[comm_id % len(color_palette)]
             for user in users:
-                if user in selected_users:
+                if user in selected_set:
                     user_to_community[user] = comm_id
         
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
+        # Centralidades como vetores indexados pelo ID, convertidas uma vez
+        metric_arrays = {
+            metric: self._centrality_array(centrality_data.get(metric, {}), graph.getVertexCount())
+            for metric in ('degree_centrality', 'betweenness_centrality', 'pagerank_centrality')
+        }
+        
+        fig = self._new_figure(figsize=(20, 16))
+        (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
         
         # 1. GRAFO POR CENTRALIDADE DE GRAU
-        self._draw_graph_view(ax1, graph, positions, selected_users, user_mapping,
-                             centrality_data.get('degree_centrality', {}),
+        self._draw_graph_view(ax1, graph, positions, adjacency, user_mapping,
+                             metric_arrays['degree_centrality'],
                              "Grafo por Centralidade de Grau", "Degree Centrality")
         
         # 2. GRAFO POR BETWEENNESS CENTRALITY
-        self._draw_graph_view(ax2, graph, positions, selected_users, user_mapping,
-                             centrality_data.get('betweenness_centrality', {}),
+        self._draw_graph_view(ax2, graph, positions, adjacency, user_mapping,
+                             metric_arrays['betweenness_centrality'],
                              "Grafo por Intermediação", "Betweenness")
         
         # 3. GRAFO POR PAGERANK
-        self._draw_graph_view(ax3, graph, positions, selected_users, user_mapping,
-                             centrality_data.get('pagerank_centrality', {}),
+        self._draw_graph_view(ax3, graph, positions, adjacency, user_mapping,
+                             metric_arrays['pagerank_centrality'],
                              "Grafo por PageRank", "PageRank")
         
         # 4. GRAFO POR COMUNIDADES
-        self._draw_community_graph(ax4, graph, positions, selected_users, user_mapping,
+        self._draw_community_graph(ax4, graph, positions, adjacency, user_mapping,
                                   user_to_community, community_colors)
         
-        plt.suptitle('Visualização da Rede de Colaboração\n(Top 50 Usuários por Centralidade)', 
+        fig.suptitle('Visualização da Rede de Colaboração\n(Top 50 Usuários por Centralidade)', 
                      fontweight='bold', fontsize=18)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.tight_layout()
+        self._save_figure(save_path, raster=True)
         
         print(f"📊 Grafo de rede manual salvo: {save_path}")
     
@@ -873,87 +1119,82 @@ class GraphVisualizer:
         Returns:
             Dicionário {user_id: (x, y)}
         """
-        import random
-        import math
-        
-        # Posições iniciais aleatórias
-        positions = {}
-        for user in selected_users:
-            positions[user] = (random.uniform(-5, 5), random.uniform(-5, 5))
+        # Posições em um vetor (N, 2); idx mapeia usuário -> linha
+        idx = {user: i for i, user in enumerate(selected_users)}
+        pos = np.random.uniform(-5, 5, (len(selected_users), 2))  # Posições iniciais aleatórias
+        
+        # Arestas induzidas entre os usuários selecionados, já como linhas de
+        # pos, extraídas uma única vez da CSR
+        row_of = np.full(graph.getVertexCount(), -1, dtype=np.int64)
+        row_of[selected_users] = np.arange(len(selected_users))
+        sources, targets = self._extract_edges(graph)
+        edge_sources, edge_targets = row_of[sources], row_of[targets]
+        induced = (edge_sources >= 0) & (edge_targets >= 0)
+        edge_sources, edge_targets = edge_sources[induced], edge_targets[induced]
         
         # Parâmetros do algoritmo
         k = 2.0  # Distância ideal entre nós
         area = 100.0
         dt = 0.1  # Passo temporal
         
+        # Posições em float32 (metade da memória nos pares O(N²); precisão
+        # de sobra para desenhar) e índices das arestas em int32
+        pos = pos.astype(np.float32)
+        k = np.float32(k)
+        edge_sources = edge_sources.astype(np.int32)
+        edge_targets = edge_targets.astype(np.int32)
         for iteration in range(iterations):
-            # Calcula forças
-            forces = {user: [0.0, 0.0] for user in selected_users}
-            
-            # Força de repulsão (todos se repelem)
-            for i, user1 in enumerate(selected_users):
-                for j, user2 in enumerate(selected_users[i+1:], i+1):
-                    x1, y1 = positions[user1]
-                    x2, y2 = positions[user2]
-                    
-                    dx = x1 - x2
-                    dy = y1 - y2
-                    distance = max(0.01, (dx**2 + dy**2)**0.5)
-                    
-                    # Força de repulsão de Coulomb
-                    force = k * k / distance
-                    fx = force * dx / distance
-                    fy = force * dy / distance
-                    
-                    forces[user1][0] += fx
-                    forces[user1][1] += fy
-                    forces[user2][0] -= fx
-                    forces[user2][1] -= fy
-            
-            # Força de atração (nós conectados se atraem)
-            for user1 in selected_users:
-                successors = graph.getSuccessors(user1)
-                for user2 in successors:
-                    if user2 in selected_users:
-                        x1, y1 = positions[user1]
-                        x2, y2 = positions[user2]
-                        
-                        dx = x2 - x1
-                        dy = y2 - y1
-                        distance = max(0.01, (dx**2 + dy**2)**0.5)
-                        
-                        # Força de atração de mola
-                        force = distance * distance / k
-                        fx = force * dx / distance
-                        fy = force * dy / distance
-                        
-                        forces[user1][0] += fx
-                        forces[user1][1] += fy
-                        forces[user2][0] -= fx
-                        forces[user2][1] -= fy
+            forces = self._layout_forces(pos, edge_sources, edge_targets, k)
             
-            # Atualiza posições
-            for user in selected_users:
-                fx, fy = forces[user]
-                
-                # Limita força máxima
-                force_mag = (fx**2 + fy**2)**0.5
-                if force_mag > 1.0:
-                    fx = fx / force_mag
-                    fy = fy / force_mag
-                
-                # Atualiza posição
-                x, y = positions[user]
-                positions[user] = (x + fx * dt, y + fy * dt)
+            # Limita força máxima e atualiza posições
+            force_mag = np.sqrt((forces ** 2).sum(axis=1))
+            too_strong = force_mag > 1.0
+            forces[too_strong] /= force_mag[too_strong, None]
+            pos += forces * dt
             
             # Resfriamento (reduz dt ao longo do tempo)
             dt *= 0.99
         
-        return positions
+        return {user: (float(pos[i, 0]), float(pos[i, 1])) for user, i in idx.items()}
+    
+    @staticmethod
+    def _layout_forces(pos: np.ndarray, edge_sources: np.ndarray, edge_targets: np.ndarray,
+                       k: float) -> np.ndarray:
+        """
+        Força resultante do layout spring em cada nó: atração d² / k nas
+        arestas e repulsão k² / d entre todos os pares.
+        
+        Args:
+            pos: Posições (N, 2)
+            edge_sources: Linha de origem de cada aresta induzida
+            edge_targets: Linha de destino de cada aresta induzida
+            k: Distância ideal entre nós
+            
+        Returns:
+            Forças (N, 2)
+        """
+        # Força de repulsão (todos se repelem): todos os pares de uma vez
+        # por broadcasting; a diagonal infinita anula o par (i, i)
+        diff = pos[:, None, :] - pos[None, :, :]
+        distance = np.maximum(0.01, np.sqrt((diff ** 2).sum(axis=-1)))
+        np.fill_diagonal(distance, np.inf)
+        
+        # Força de repulsão de Coulomb: k² / d na direção do par
+        forces = (k * k * diff / (distance ** 2)[..., None]).sum(axis=1)
+        
+        # Força de atração de mola (nós conectados se atraem): d² / k na
+        # direção da aresta, somada nas duas pontas com np.add.at
+        delta = pos[edge_targets] - pos[edge_sources]
+        edge_length = np.maximum(0.01, np.sqrt((delta ** 2).sum(axis=1)))
+        attraction = (edge_length / k)[:, None] * delta
+        np.add.at(forces, edge_sources, attraction)
+        np.add.at(forces, edge_targets, -attraction)
+        
+        return forces
     
     def _draw_graph_view(self, ax, graph, positions: Dict[int, Tuple[float, float]], 
-                        selected_users: List[int], user_mapping: Dict[int, str],
-                        centrality_values: Dict[str, float], title: str, metric_name: str):
+                        adjacency: Dict[int, List[Tuple[int, float]]], user_mapping: Dict[int, str],
+                        centrality_values: np.ndarray, title: str, metric_name: str):
         """
         Desenha uma visão do grafo colorida por uma métrica específica.
         
@@ -961,51 +1202,50 @@ class GraphVisualizer:
             ax: Axes do matplotlib
             graph: Grafo a desenhar
             positions: Posições dos nós
-            selected_users: Usuários selecionados
+            adjacency: (sucessor, peso) de cada usuário selecionado, só entre selecionados
             user_mapping: Mapeamento ID -> nome
-            centrality_values: Valores da métrica para colorir
+            centrality_values: Valores da métrica para colorir, indexados pelo ID
             title: Título do gráfico
             metric_name: Nome da métrica
         """
-        # Desenha arestas primeiro (para ficarem atrás dos nós)
-        for user1 in selected_users:
+        # Desenha arestas primeiro (para ficarem atrás dos nós): acumula os
+        # segmentos e desenha todos numa única LineCollection, rasterizada
+        # para não virar milhares de caminhos em saídas vetoriais
+        segments = []
+        weights = []
+        for user1, successors in adjacency.items():
             if user1 not in positions:
                 continue
                 
-            successors = graph.getSuccessors(user1)
-            for user2 in successors:
-                if user2 in selected_users and user2 in positions:
-                    x1, y1 = positions[user1]
-                    x2, y2 = positions[user2]
-                    
-                    # Peso da aresta determina espessura
-                    weight = graph.getEdgeWeight(user1, user2) if graph.hasEdge(user1, user2) else 1
-                    line_width = max(0.2, min(2.0, weight / 3))
-                    
-                    ax.plot([x1, x2], [y1, y2], color='gray', alpha=0.4, linewidth=line_width)
-        
-        # Desenha nós
-        for user in selected_users:
-            if user not in positions:
-                continue
-                
-            x, y = positions[user]
-            centrality = centrality_values.get(str(user), 0)
-            
-            # Tamanho baseado na centralidade
-            size = 50 + centrality * 800
-            
-            # Cor baseada na centralidade (normalizada)
-            max_centrality = max(centrality_values.values()) if centrality_values else 1
-            color_intensity = centrality / max_centrality if max_centrality > 0 else 0
-            
-            ax.scatter(x, y, s=size, c=color_intensity, cmap='viridis', 
-                      alpha=0.8, edgecolors='black', linewidth=0.5)
-            
-            # Label para nós mais importantes
-            if centrality > max_centrality * 0.5:
-                username = user_mapping.get(user, f"user_{user}")
-                short_name = username[:6] + '..' if len(username) > 6 else username
+            for user2, weight in successors:
+                if user2 in positions:
+                    segments.append((positions[user1], positions[user2]))
+                    weights.append(weight)
+        
+        if segments:
+            # Peso da aresta determina espessura
+            line_widths = np.clip(np.array(weights) / 3, 0.2, 2.0)
+            ax.add_collection(LineCollection(segments, linewidths=line_widths,
+                                             colors='gray', alpha=0.4, rasterized=True))
+        
+        # Desenha nós: vetores de posição e centralidade montados numa
+        # passada e um único scatter para todos
+        users = [user for user in adjacency if user in positions]
+        xy = np.array([positions[user] for user in users]).reshape(-1, 2)
+        centrality = centrality_values[np.array(users, dtype=np.int64)]
+        
+        # Cor baseada na centralidade, na escala [0, máximo] da colorbar
+        max_centrality = float(centrality_values.max(initial=0.0)) or 1.0
+        
+        # Tamanho baseado na centralidade
+        nodes = ax.scatter(xy[:, 0], xy[:, 1], s=50 + centrality * 800, c=centrality,
+                           cmap='viridis', vmin=0, vmax=max_centrality,
+                           alpha=0.8, edgecolors='black', linewidth=0.5)
+        
+        # Label para nós mais importantes
+        for user, (x, y), value in zip(users, xy, centrality):
+            if value > max_centrality * 0.5:
+                short_name = self._display_name(user_mapping, user, 6, '..')
                 ax.annotate(short_name, (x, y), xytext=(3, 3), textcoords='offset points',
                            fontsize=7, ha='left', weight='bold')
         
@@ -1014,14 +1254,12 @@ class GraphVisualizer:
         ax.set_ylabel('Posição Y')
         ax.grid(True, alpha=0.3)
         
-        # Colorbar
-        sm = plt.cm.ScalarMappable(cmap='viridis', norm=plt.Normalize(vmin=0, vmax=max_centrality))
-        sm.set_array([])
-        cbar = plt.colorbar(sm, ax=ax, shrink=0.8)
+        # Colorbar direto do scatter dos nós (mesmo cmap e escala)
+        cbar = ax.figure.colorbar(nodes, ax=ax, shrink=0.8)
         cbar.set_label(metric_name, fontsize=9)
     
     def _draw_community_graph(self, ax, graph, positions: Dict[int, Tuple[float, float]], 
-                             selected_users: List[int], user_mapping: Dict[int, str],
+                             adjacency: Dict[int, List[Tuple[int, float]]], user_mapping: Dict[int, str],
                              user_to_community: Dict[int, int], community_colors: Dict[int, str]):
         """
         Desenha grafo colorido por comunidades.
@@ -1030,63 +1268,47 @@ class GraphVisualizer:
             ax: Axes do matplotlib
             graph: Grafo a desenhar
             positions: Posições dos nós
-            selected_users: Usuários selecionados
+            adjacency: (sucessor, peso) de cada usuário selecionado, só entre selecionados
             user_mapping: Mapeamento ID -> nome
             user_to_community: Mapeamento usuário -> comunidade
             community_colors: Cores das comunidades
         """
-        # Desenha arestas coloridas por tipo (intra vs inter-comunidade)
-        for user1 in selected_users:
-            if user1 not in positions:
-                continue
-                
-            successors = graph.getSuccessors(user1)
-            for user2 in successors:
-                if user2 in selected_users and user2 in positions:
-                    x1, y1 = positions[user1]
-                    x2, y2 = positions[user2]
-                    
-                    # Cor da aresta baseada se é intra ou inter-comunidade
-                    comm1 = user_to_community.get(user1, -1)
-                    comm2 = user_to_community.get(user2, -1)
-                    
-                    if comm1 == comm2 and comm1 != -1:
-                        # Aresta interna da comunidade
-                        color = community_colors.get(comm1, 'gray')
-                        alpha = 0.6
-                        linewidth = 1.0
-                    else:
-                        # Aresta entre comunidades (bridging tie)
-                        color = 'red'
-                        alpha = 0.8
-                        linewidth = 1.5
-                    
-                    ax.plot([x1, x2], [y1, y2], color=color, alpha=alpha, linewidth=linewidth)
-        
-        # Desenha nós coloridos por comunidade
-        for user in selected_users:
-            if user not in positions:
-                continue
-                
-            x, y = positions[user]
-            community = user_to_community.get(user, -1)
-            
-            if community != -1:
-                color = community_colors.get(community, 'gray')
-                size = 100
-                alpha = 0.8
-            else:
-                color = 'lightgray'
-                size = 60
-                alpha = 0.5
-            
-            ax.scatter(x, y, s=size, color=color, alpha=alpha, 
-                      edgecolors='black', linewidth=0.5)
-            
-            # Labels para alguns nós
-            if community != -1 and len(graph.getSuccessors(user)) > 2:
-                username = user_mapping.get(user, f"user_{user}")
-                short_name = username[:5] + '..' if len(username) > 5 else username
+        # Comunidade e cor de cada usuário desenhado, consultadas uma vez por
+        # nó; as arestas usam só índices nesses vetores
+        users = [user for user in adjacency if user in positions]
+        row = {user: i for i, user in enumerate(users)}
+        xy = np.array([positions[user] for user in users]).reshape(-1, 2)
+        community_of = np.array([user_to_community.get(user, -1) for user in users], dtype=np.int64)
+        in_community = community_of != -1
+        node_colors = to_rgba_array([community_colors.get(community, 'gray') if community != -1
+                                     else 'lightgray' for community in community_of.tolist()])
+        
+        # Arestas como pares de linhas; intra-comunidade quando as duas pontas
+        # estão na mesma comunidade, senão bridging tie
+        edges = np.array([(row[user1], row[user2])
+                          for user1, successors in adjacency.items() if user1 in row
+                          for user2, _ in successors if user2 in row],
+                         dtype=np.int64).reshape(-1, 2)
+        sources, targets = edges[:, 0], edges[:, 1]
+        intra = (community_of[sources] == community_of[targets]) & in_community[sources]
+        
+        # Desenha arestas coloridas por tipo, uma LineCollection para cada
+        if intra.any():
+            ax.add_collection(LineCollection(np.stack([xy[sources[intra]], xy[targets[intra]]], axis=1),
+                                             colors=node_colors[sources[intra]],
+                                             linewidths=1.0, alpha=0.6, rasterized=True))
+        if (~intra).any():
+            ax.add_collection(LineCollection(np.stack([xy[sources[~intra]], xy[targets[~intra]]], axis=1),
+                                             colors='red', linewidths=1.5, alpha=0.8, rasterized=True))
+        
+        # Desenha nós coloridos por comunidade num único scatter
+        ax.scatter(xy[:, 0], xy[:, 1], s=np.where(in_community, 100, 60), color=node_colors,
+                   alpha=np.where(in_community, 0.8, 0.5), edgecolors='black', linewidth=0.5)
+        
+        # Labels para alguns nós
+        for user, (x, y) in zip(users, xy):
+            if user in user_to_community and len(graph.getSuccessorsView(user)) > 2:
+                short_name = self._display_name(user_mapping, user, 5, '..')
                 ax.annotate(short_name, (x, y), xytext=(3, 3), textcoords='offset points',
                            fontsize=6, ha='left')
         
@@ -1110,6 +1332,7 @@ class GraphVisualizer:
                                    graph,
                                    analyzer,
                                    user_mapping: Dict[int, str],
+                                   centrality_data: Optional[Dict[str, Dict[str, float]]] = None,
                                    save_path: str = "bridging_ties_detalhado.png"):
         """
         Análise detalhada dos bridging ties (usuários ponte).
@@ -1118,19 +1341,21 @@ class GraphVisualizer:
             graph: Grafo para análise
             analyzer: Analisador com métodos de comunidade
             user_mapping: Mapeamento ID -> username
+            centrality_data: Centralidades já calculadas (opcional); sem elas,
+                grau e intermediação vêm do analisador
             save_path: Caminho para salvar
         """
         communities = analyzer._detect_simple_communities()
         bridging_users = self._find_bridging_users(graph, communities, user_mapping)
         
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+        fig = self._new_figure(figsize=(16, 12))
+        (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
         
         # 1. Top Bridging Users
         if bridging_users:
-            top_bridging = sorted(bridging_users.items(), key=lambda x: x[1], reverse=True)[:15]
+            top_bridging = heapq.nlargest(15, bridging_users.items(), key=itemgetter(1))
             
-            names = [user_mapping.get(user_id, f"user_{user_id}")[:12] + 
-                    ('...' if len(user_mapping.get(user_id, '')) > 12 else '')
+            names = [self._display_name(user_mapping, user_id, 12)
                     for user_id, _ in top_bridging]
             counts = [count for _, count in top_bridging]
             
@@ -1143,22 +1368,21 @@ class GraphVisualizer:
             ax1.grid(True, alpha=0.3, axis='x')
             
             # Adiciona valores
-            for bar, count in zip(bars, counts):
-                ax1.text(bar.get_width() + max(counts) * 0.01, bar.get_y() + bar.get_height()/2,
-                        str(count), va='center', fontweight='bold')
-        
-        # 2. Distribuição de Bridging Ties por Comunidade
-        community_bridging = {}
+            ax1.bar_label(bars, padding=3, fontweight='bold')
         
-        for comm_id, users in communities.items():
-            bridging_count = 0
-            for user in users:
-                bridging_count += bridging_users.get(user, 0)
-            community_bridging[comm_id] = bridging_count
+        # 2. Distribuição de Bridging Ties por Comunidade: soma por comunidade
+        # com um único bincount sobre os vetores usuário -> comunidade/pontes
+        community_of = self._community_vector(graph, communities)
+        bridging_of = np.zeros(len(community_of), dtype=np.int64)
+        if bridging_users:
+            bridging_of[list(bridging_users.keys())] = list(bridging_users.values())
+        member = community_of >= 0
+        totals = np.bincount(community_of[member], weights=bridging_of[member],
+                             minlength=max(communities, default=-1) + 1)
+        community_bridging = {comm_id: int(totals[comm_id]) for comm_id in communities}
         
         # Top 10 comunidades com mais bridging ties
-        top_comm_bridging = sorted(community_bridging.items(), 
-                                 key=lambda x: x[1], reverse=True)[:10]
+        top_comm_bridging = heapq.nlargest(10, community_bridging.items(), key=itemgetter(1))
         
         if top_comm_bridging:
             comm_labels = [f'Comunidade {comm_id}' for comm_id, _ in top_comm_bridging]
@@ -1172,18 +1396,26 @@ class GraphVisualizer:
             ax2.set_title('Bridging Ties por Comunidade', fontweight='bold')
             ax2.grid(True, alpha=0.3, axis='y')
             
-            # Adiciona valores
-            for bar, count in zip(bars2, bridging_counts):
-                if count > 0:
-                    ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(bridging_counts) * 0.01,
-                            str(count), ha='center', va='bottom', fontweight='bold')
+            # Adiciona valores (comunidades sem bridging ties ficam sem rótulo)
+            ax2.bar_label(bars2, labels=[str(count) if count > 0 else '' for count in bridging_counts],
+                          padding=3, fontweight='bold')
         
         # 3. Relação entre Centralidade e Bridging
         if bridging_users:
-            from .GraphAnalyzer import GraphAnalyzer
-            temp_analyzer = GraphAnalyzer(graph)
-            degree_centrality = temp_analyzer.calculate_degree_centrality()
-            betweenness_centrality = temp_analyzer.calculate_betweenness_centrality()
+            # Usa as centralidades recebidas; o analisador só é consultado
+            # (memoizado) para as que faltarem
+            centrality_data = centrality_data or {}
+            degree_centrality = centrality_data.get('degree_centrality')
+            if degree_centrality is None:
+                degree_centrality = analyzer.calculate_degree_centrality()
+            betweenness_centrality = centrality_data.get('betweenness_centrality')
+            if betweenness_centrality is None:
+                # Só para posicionar pontos no gráfico: basta a aproximação
+                # por amostragem de ~√V origens (exata em grafos pequenos),
+                # com semente fixa para o gráfico não mudar entre execuções
+                sample_k = max(50, int(np.sqrt(analyzer.num_vertices)))
+                betweenness_centrality = analyzer.calculate_betweenness_centrality(
+                    sample_k=sample_k, seed=42)
             
             bridging_values = []
             degree_values = []
@@ -1212,14 +1444,44 @@ class GraphVisualizer:
                 ax4.set_title('Bridging Ties vs Intermediação', fontweight='bold')
                 ax4.grid(True, alpha=0.3)
         
-        plt.suptitle('Análise Detalhada de Bridging Ties', fontweight='bold', fontsize=16)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, save_path), 
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.suptitle('Análise Detalhada de Bridging Ties', fontweight='bold', fontsize=16)
+        fig.tight_layout()
+        self._save_figure(save_path)
         
         print(f"📊 Análise detalhada de bridging ties salva: {save_path}")
     
+    @staticmethod
+    def _json_default(value):
+        """Converte valores NumPy para tipos nativos no json da biblioteca padrão."""
+        if isinstance(value, (np.generic, np.ndarray)):
+            return value.tolist()
+        raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+    
+    def save_json(self, data: Dict, save_path: str) -> str:
+        """
+        Salva um dicionário em JSON (indentado, UTF-8) no diretório de saída.
+        
+        Usa orjson se disponível e o módulo json da biblioteca padrão
+        caso contrário; chaves inteiras viram strings e valores NumPy
+        (escalares e vetores) são aceitos nos dois casos.
+        
+        Args:
+            data: Dados a serializar
+            save_path: Nome do arquivo
+            
+        Returns:
+            Caminho completo do arquivo salvo
+        """
+        path = os.path.join(self.output_dir, save_path)
+        if orjson is not None:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                                     | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False, default=self._json_default)
+        return path
+    
     def create_summary_report(self, 
                              analysis_results: Dict,
                              user_mapping: Dict[int, str],
@@ -1232,20 +1494,15 @@ class GraphVisualizer:
             user_mapping: Mapeamento ID -> username
             save_path: Caminho para salvar o relatório
         """
-        # Converte IDs para usernames nos resultados de centralidade
-        centrality_by_user = {}
-        
-        for metric, data in analysis_results.get('centrality', {}).items():
-            centrality_by_user[metric] = {}
-            for user_id, value in data.items():
-                username = user_mapping.get(int(user_id), f"user_{user_id}")
-                centrality_by_user[metric][username] = value
-        
-        # Encontra top usuários por métrica
+        # Top usuários por métrica, direto dos dicionários por ID: apenas os
+        # 10 escolhidos são convertidos para username
+        names = self._user_names_for(user_mapping)
         top_users_by_metric = {}
-        for metric, data in centrality_by_user.items():
-            sorted_users = sorted(data.items(), key=lambda x: x[1], reverse=True)
-            top_users_by_metric[metric] = sorted_users[:10]
+        for metric, data in analysis_results.get('centrality', {}).items():
+            top_users_by_metric[metric] = [
+                (names.get(user_id, f"user_{user_id}"), value)
+                for user_id, value in heapq.nlargest(10, data.items(), key=itemgetter(1))
+            ]
         
         # Monta relatório
         report = {
@@ -1261,9 +1518,7 @@ class GraphVisualizer:
         }
         
         # Salva relatório
-        report_path = os.path.join(self.output_dir, save_path)
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        self.save_json(report, save_path)
         
         print(f"📋 Relatório resumo salvo: {save_path}")
         return report
@@ -1316,9 +1571,10 @@ class GraphVisualizer:
         degree_centrality = centrality.get('degree_centrality', {})
         
         if degree_centrality:
-            top_user = max(degree_centrality.items(), key=lambda x: x[1])
-            username = user_mapping.get(int(top_user[0]), f"user_{top_user[0]}")
-            insights.append(f"Usuário mais conectado: {username} (grau: {top_user[1]:.3f})")
+            # dict.get como chave: a varredura roda em C, sem lambda por item
+            top_user_id = max(degree_centrality, key=degree_centrality.get)
+            username = self._user_names_for(user_mapping).get(top_user_id, f"user_{top_user_id}")
+            insights.append(f"Usuário mais conectado: {username} (grau: {degree_centrality[top_user_id]:.3f})")
         
         # Insights sobre comunidades
         community = analysis_results.get('community_metrics', {})